@@ -0,0 +1 @@
+"""Offline benchmarks for the GoTo Connect Call Stats integration."""
@@ -0,0 +1,267 @@
+"""Seeded synthetic call traffic for the benchmarks.
+
+Generates call logs shaped like a real phone system rather than spread
+evenly: weekday business hours with a burst at the start of the day,
+quiet weekends, long-tailed talk times, short spikes of missed calls and
+many lines of very different activity. The same seed always yields the
+same calls for the same --end.
+
+Write a day of traffic as JSON Lines in the calls endpoint shape with:
+
+    python -m benchmarks.generator --calls-per-day 5000 --days 1 --output calls.jsonl
+"""
+
+import argparse
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from .mock_api import CallLog
+
+_DAY = 86400
+_HOUR = 3600
+
+# Direction codes of the mock's call log
+_INCOMING, _OUTGOING, _MISSED = 0, 1, 2
+
+
+@dataclass
+class TrafficProfile:
+    """Shape of the generated traffic."""
+
+    calls_per_day: float = 2000
+    lines: int = 200
+    queues: int = 8
+    # Share of the day's calls in the burst at the start of the day
+    burst_hour: float = 9.0
+    burst_share: float = 0.2
+    burst_minutes: float = 20
+    # Business hours carry everything outside the burst but a trickle
+    open_hour: float = 8.0
+    close_hour: float = 18.0
+    after_hours_share: float = 0.03
+    weekend_factor: float = 0.15
+    # Directions; missed calls are far more likely during a spike
+    outgoing_share: float = 0.35
+    missed_share: float = 0.08
+    spikes_per_day: float = 2.0
+    spike_minutes: Tuple[float, float] = (10, 40)
+    spike_missed_share: float = 0.6
+    # Talk time: a log-normal body with a Pareto tail
+    median_duration: float = 90
+    duration_sigma: float = 0.9
+    tail_share: float = 0.04
+    tail_scale: float = 600
+    tail_alpha: float = 1.4
+    max_duration: int = 4 * _HOUR
+    # Share of incoming calls routed through a queue
+    queued_share: float = 0.4
+    # Zipf exponent of line activity; higher means a few very busy lines
+    line_skew: float = 1.1
+
+
+class TrafficGenerator:
+    """Generate call logs from a traffic profile and a seed."""
+
+    def __init__(self, profile: Optional[TrafficProfile] = None, seed: int = 0) -> None:
+        """Initialize the generator."""
+        self.profile = profile or TrafficProfile()
+        self._rng = random.Random(seed)
+        self._line_weights = self._cumulative(
+            [1 / (line + 1) ** self.profile.line_skew for line in range(self.profile.lines)]
+        )
+
+    @staticmethod
+    def _cumulative(weights: List[float]) -> List[float]:
+        """Return cumulative weights for random.choices."""
+        total = 0.0
+        cumulative = []
+        for weight in weights:
+            total += weight
+            cumulative.append(total)
+        return cumulative
+
+    def _poisson(self, mean: float) -> int:
+        """Return a Poisson distributed count, normal for large means."""
+        if mean <= 0:
+            return 0
+        if mean > 50:
+            return max(0, round(self._rng.gauss(mean, math.sqrt(mean))))
+        limit, count, product = math.exp(-mean), 0, self._rng.random()
+        while product > limit:
+            count += 1
+            product *= self._rng.random()
+        return count
+
+    def _time_of_day(self) -> float:
+        """Return the second of the day a call starts at."""
+        profile, rng = self.profile, self._rng
+        draw = rng.random()
+        if draw < profile.burst_share:
+            second = rng.gauss(
+                (profile.burst_hour + profile.burst_minutes / 120) * _HOUR,
+                profile.burst_minutes * 30,
+            )
+        elif draw < profile.burst_share + profile.after_hours_share:
+            return rng.uniform(0, _DAY)
+        else:
+            # Busier late morning and early afternoon than at the edges
+            second = rng.triangular(
+                profile.open_hour * _HOUR,
+                profile.close_hour * _HOUR,
+                (profile.open_hour + profile.close_hour) / 2 * _HOUR,
+            )
+        return min(max(second, 0.0), _DAY - 1.0)
+
+    def _spikes(self) -> List[Tuple[float, float]]:
+        """Return the missed-call spikes of a day as second-of-day ranges."""
+        profile, rng = self.profile, self._rng
+        spikes = []
+        for _ in range(self._poisson(profile.spikes_per_day)):
+            start = rng.uniform(profile.open_hour * _HOUR, profile.close_hour * _HOUR)
+            spikes.append((start, start + rng.uniform(*profile.spike_minutes) * 60))
+        return spikes
+
+    def _duration(self) -> int:
+        """Return a talk time in seconds."""
+        profile, rng = self.profile, self._rng
+        if rng.random() < profile.tail_share:
+            duration = profile.tail_scale * rng.paretovariate(profile.tail_alpha)
+        else:
+            duration = rng.lognormvariate(
+                math.log(profile.median_duration), profile.duration_sigma
+            )
+        return min(int(duration), profile.max_duration)
+
+    def _day(self, day_start: float, weekday: int) -> List[Tuple[float, int, int, int, int]]:
+        """Return the calls of one day as (start, duration, direction, line, queue)."""
+        profile, rng = self.profile, self._rng
+        factor = profile.weekend_factor if weekday >= 5 else 1.0
+        spikes = self._spikes() if weekday < 5 else []
+        lines = range(profile.lines)
+
+        calls = []
+        for _ in range(self._poisson(profile.calls_per_day * factor)):
+            second = self._time_of_day()
+            missed_share = profile.missed_share
+            if any(start <= second < end for start, end in spikes):
+                missed_share = profile.spike_missed_share
+
+            draw = rng.random()
+            if draw < missed_share:
+                direction, duration = _MISSED, 0
+            elif draw < missed_share + (1 - missed_share) * profile.outgoing_share:
+                direction, duration = _OUTGOING, self._duration()
+            else:
+                direction, duration = _INCOMING, self._duration()
+
+            queue = -1
+            if (
+                direction != _OUTGOING
+                and profile.queues
+                and rng.random() < profile.queued_share
+            ):
+                queue = rng.randrange(profile.queues)
+            line = rng.choices(lines, cum_weights=self._line_weights)[0]
+            calls.append((day_start + second, duration, direction, line, queue))
+
+        calls.sort()
+        return calls
+
+    def generate(self, days: float, end: Optional[float] = None) -> CallLog:
+        """Return the calls of the days before end (a POSIX timestamp, now by default).
+
+        Days follow UTC midnight, so the burst lands at the profile's hour
+        in UTC.
+        """
+        end = time.time() if end is None else end
+        first_day = math.floor((end - days * _DAY) / _DAY)
+        last_day = math.floor(end / _DAY)
+
+        log = CallLog()
+        for day in range(first_day, last_day + 1):
+            # 1970-01-01 was a Thursday
+            weekday = (day + 3) % 7
+            for start, duration, direction, line, queue in self._day(day * _DAY, weekday):
+                if not end - days * _DAY <= start < end:
+                    continue
+                log.append(
+                    start,
+                    duration,
+                    direction,
+                    f"line-{line}",
+                    f"user-{line}",
+                    f"queue-{queue}" if queue >= 0 else None,
+                )
+        return log
+
+
+def parse_end(value: str) -> float:
+    """Parse an --end value, a POSIX timestamp or an ISO date or time.
+
+    Dates and times without an offset are taken as UTC.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        end = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"expected a POSIX timestamp or an ISO date: {value}"
+        ) from e
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    return end.timestamp()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the traffic profile options to a command line parser."""
+    parser.add_argument(
+        "--calls-per-day", type=float, default=2000, help="weekday calls per day"
+    )
+    parser.add_argument("--lines", type=int, default=200, help="distinct lines")
+    parser.add_argument("--queues", type=int, default=8, help="distinct queues")
+    parser.add_argument(
+        "--spikes-per-day", type=float, default=2.0, help="missed-call spikes per day"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--end",
+        type=parse_end,
+        help="end of the traffic, a POSIX timestamp or an ISO date (UTC); "
+        "now by default",
+    )
+
+
+def profile_from_args(args: argparse.Namespace) -> TrafficProfile:
+    """Return the traffic profile selected on the command line."""
+    return TrafficProfile(
+        calls_per_day=args.calls_per_day,
+        lines=args.lines,
+        queues=args.queues,
+        spikes_per_day=args.spikes_per_day,
+    )
+
+
+def main() -> None:
+    """Generate traffic and write it as JSON Lines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--days", type=float, default=1, help="days of traffic")
+    parser.add_argument("--output", required=True, help="JSON Lines file to write")
+    args = parser.parse_args()
+
+    log = TrafficGenerator(profile_from_args(args), args.seed).generate(
+        args.days, args.end
+    )
+    log.dump(args.output)
+    print(f"Wrote {len(log)} calls to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Run the coordinator against a mock GoTo API outside Home Assistant."""
+
+import asyncio
+import inspect
+import resource
+import sys
+import time
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+
+from custom_components.goto_connect_call_stats import coordinator as coordinator_module
+from custom_components.goto_connect_call_stats import oauth as oauth_module
+from custom_components.goto_connect_call_stats.const import DOMAIN
+from custom_components.goto_connect_call_stats.coordinator import (
+    GoToConnectCallStatsCoordinator,
+)
+from custom_components.goto_connect_call_stats.ratelimit import (
+    DATA_REQUEST_SCHEDULER,
+    GoToRequestScheduler,
+)
+
+from .mock_api import TOKEN_PATH
+
+# Ledger methods whose CPU time counts as aggregation
+AGGREGATION_METHODS = ("merge", "load", "prune", "window_stats", "group_stats")
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _make_entry(options: Dict[str, Any]) -> config_entries.ConfigEntry:
+    """Return a config entry holding an expired token, across HA versions."""
+    kwargs: Dict[str, Any] = {
+        "version": 1,
+        "domain": DOMAIN,
+        "title": "Benchmark",
+        "data": {
+            "client_id": "benchmark",
+            "client_secret": "benchmark",
+            # Expired, so the first poll goes through the token endpoint
+            "tokens": {
+                "access_token": "expired",
+                "refresh_token": "benchmark-refresh",
+                "token_expires_at": time.time() - 60,
+            },
+        },
+        "source": config_entries.SOURCE_USER,
+        "options": options,
+        "entry_id": "benchmark",
+    }
+    parameters = inspect.signature(config_entries.ConfigEntry).parameters
+    for name, value in (
+        ("minor_version", 1),
+        ("unique_id", None),
+        ("discovery_keys", MappingProxyType({})),
+    ):
+        if name in parameters:
+            kwargs[name] = value
+    return config_entries.ConfigEntry(**kwargs)
+
+
+class AggregationTimer:
+    """Accumulate the CPU time spent in the coordinator's ledger."""
+
+    def __init__(self, coordinator: GoToConnectCallStatsCoordinator) -> None:
+        """Wrap the aggregation methods of the coordinator's ledger."""
+        self.cpu_time = 0.0
+        ledger = coordinator._ledger
+        for name in AGGREGATION_METHODS:
+            setattr(ledger, name, self._timed(getattr(ledger, name)))
+
+    def _timed(self, method: Callable) -> Callable:
+        """Return a method that adds its CPU time to the total."""
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.thread_time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.cpu_time += time.thread_time() - started
+
+        return timed
+
+    def take(self) -> float:
+        """Return and reset the CPU time accumulated so far."""
+        cpu_time, self.cpu_time = self.cpu_time, 0.0
+        return cpu_time
+
+
+@asynccontextmanager
+async def async_coordinator(
+    config_dir: str,
+    base_url: str,
+    options: Optional[Dict[str, Any]] = None,
+    rate: float = 1000,
+    burst: float = 1000,
+) -> AsyncIterator[Tuple[HomeAssistant, GoToConnectCallStatsCoordinator]]:
+    """Yield a coordinator wired to the mock API at base_url.
+
+    The request scheduler is created with the given rate so the mock,
+    not the production rate limit, decides how fast a poll can go.
+    """
+    hass = HomeAssistant(config_dir)
+    set_time_zone = getattr(hass.config, "async_set_time_zone", None)
+    if set_time_zone is not None:
+        await set_time_zone("UTC")
+    else:
+        hass.config.set_time_zone("UTC")
+
+    # Token refreshes are saved back to the entry, which needs a registry
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    entry = _make_entry(options or {})
+    hass.config_entries._entries[entry.entry_id] = entry
+
+    hass.data.setdefault(DOMAIN, {})[DATA_REQUEST_SCHEDULER] = GoToRequestScheduler(
+        rate=rate, burst=burst
+    )
+    coordinator_module.GOTO_API_BASE_URL = base_url
+    oauth_module.OAUTH2_TOKEN_URL = f"{base_url}{TOKEN_PATH}"
+
+    coordinator = GoToConnectCallStatsCoordinator(hass, entry)
+    try:
+        yield hass, coordinator
+    finally:
+        await coordinator.async_cleanup()
+        await hass.async_stop(force=True)
+
+
+async def async_timed_refresh(
+    coordinator: GoToConnectCallStatsCoordinator,
+) -> float:
+    """Refresh the coordinator and return the wall time it took."""
+    started = time.perf_counter()
+    await coordinator.async_refresh()
+    elapsed = time.perf_counter() - started
+    # Let token saves and other follow-up tasks run outside the timing
+    await asyncio.sleep(0)
+    return elapsed
@@ -0,0 +1,541 @@
+"""Local mock of the GoTo Connect API used by the benchmarks.
+
+Serves the calls, current user and token endpoints from a seeded, in
+memory call log, and fakes the notification channel and call events
+endpoints, pushing ended call events over the channel websockets. Call
+volume, page size, response latency and the rate of injected 429
+responses are configurable, and request and channel counters are exposed
+on /_stats so a benchmark can count the requests of each poll.
+
+Run standalone with:
+
+    python -m benchmarks.mock_api --port 8089 --calls 100000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from aiohttp import WSCloseCode, web
+
+from custom_components.goto_connect_call_stats.aggregator import (
+    DIRECTION_INCOMING,
+    DIRECTION_MISSED,
+    DIRECTION_OTHER,
+    DIRECTION_OUTGOING,
+    classify_call,
+    parse_call_start,
+    to_timestamp,
+)
+from custom_components.goto_connect_call_stats.const import (
+    CALL_EVENTS_SUBSCRIPTIONS_API_URL,
+    CALLS_API_URL,
+    CALLS_NEXT_PAGE_MARKER,
+    CALLS_PAGE_MARKER_PARAM,
+    NOTIFICATION_CHANNEL_API_URL,
+    USERS_API_URL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TOKEN_PATH = "/oauth/token"
+STATS_PATH = "/_stats"
+CHANNEL_SOCKET_PATH = "/_channels"
+
+# Lifetime of the fake notification channels (seconds)
+CHANNEL_LIFETIME = 7 * 86400
+
+# Call types the mock reports, indexed by the direction codes below
+CALL_TYPES = ("incoming", "outgoing", "missed", "other")
+CALL_DIRECTIONS = {
+    DIRECTION_INCOMING: 0,
+    DIRECTION_OUTGOING: 1,
+    DIRECTION_MISSED: 2,
+    DIRECTION_OTHER: 3,
+}
+
+
+def parse_api_time(value: str) -> float:
+    """Parse a startTime/endTime query parameter into a POSIX timestamp."""
+    timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def format_api_time(value: float) -> str:
+    """Format a POSIX timestamp the way the calls endpoint does."""
+    return datetime.fromtimestamp(value, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class CallLog:
+    """Calls held as parallel arrays sorted by start time.
+
+    Line, user and queue IDs are interned, a code of -1 meaning the call
+    has none.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty call log."""
+        self.start = array("d")
+        self.duration = array("i")
+        self.direction = bytearray()
+        self.line = array("i")
+        self.user = array("i")
+        self.queue = array("i")
+        self._ids: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls held."""
+        return len(self.start)
+
+    def _code(self, value: Optional[str]) -> int:
+        """Return the code of an ID, interning it if new."""
+        if not value:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._ids)
+            self._ids.append(value)
+        return code
+
+    def _id(self, code: int) -> Optional[str]:
+        """Return the ID of a code."""
+        return self._ids[code] if code >= 0 else None
+
+    def append(
+        self,
+        start: float,
+        duration: int,
+        direction: int,
+        line: Optional[str] = None,
+        user: Optional[str] = None,
+        queue: Optional[str] = None,
+    ) -> None:
+        """Append a call that starts no earlier than the last one held."""
+        self.start.append(start)
+        self.duration.append(duration)
+        self.direction.append(direction)
+        self.line.append(self._code(line))
+        self.user.append(self._code(user))
+        self.queue.append(self._code(queue))
+
+    def append_row(self, log: "CallLog", row: int, start: float) -> None:
+        """Append a call of another log, moved to a new start time."""
+        self.append(
+            start,
+            log.duration[row],
+            log.direction[row],
+            log._id(log.line[row]),
+            log._id(log.user[row]),
+            log._id(log.queue[row]),
+        )
+
+    def as_call(self, row: int) -> Dict[str, Any]:
+        """Return a call in the shape of the calls endpoint."""
+        call = {
+            "id": f"call-{row}",
+            "startTime": format_api_time(self.start[row]),
+            "duration": self.duration[row],
+            "type": CALL_TYPES[self.direction[row]],
+            "direction": CALL_TYPES[self.direction[row]],
+        }
+        for field, code in (
+            ("lineId", self.line[row]),
+            ("userKey", self.user[row]),
+            ("queueId", self.queue[row]),
+        ):
+            if code >= 0:
+                call[field] = self._ids[code]
+        return call
+
+    def as_event(self, row: int) -> Dict[str, Any]:
+        """Return the ended call event the channel sends for a call."""
+        direction = self.direction[row]
+        start = self.start[row]
+        end = start + self.duration[row]
+        metadata = {
+            "conversationSpaceId": f"call-{row}",
+            "callCreated": format_api_time(start),
+            "callEnded": format_api_time(end),
+            "direction": "outbound" if direction == 1 else "inbound",
+        }
+        if direction != 2:
+            metadata["callAnswered"] = format_api_time(start)
+        return {
+            "type": "call-events",
+            "data": {
+                "content": {
+                    "state": {"type": "ENDING", "timestamp": format_api_time(end)},
+                    "metadata": metadata,
+                }
+            },
+        }
+
+    def calls(self) -> Iterator[Dict[str, Any]]:
+        """Yield every call in the shape of the calls endpoint."""
+        for row in range(len(self)):
+            yield self.as_call(row)
+
+    @classmethod
+    def from_calls(cls, calls: Iterable[Dict[str, Any]]) -> "CallLog":
+        """Build a call log from calls in the shape of the calls endpoint."""
+        records = []
+        for call in calls:
+            start = parse_call_start(call)
+            if start is None:
+                continue
+            records.append((to_timestamp(start), call))
+        records.sort(key=lambda record: record[0])
+
+        log = cls()
+        for start, call in records:
+            log.append(
+                start,
+                max(0, int(call.get("duration") or 0)),
+                CALL_DIRECTIONS[classify_call(call)],
+                call.get("lineId"),
+                call.get("userKey"),
+                call.get("queueId"),
+            )
+        return log
+
+    @classmethod
+    def load(cls, path: str) -> "CallLog":
+        """Load recorded calls from a file.
+
+        Accepts a JSON array of calls, a calls endpoint response or JSON
+        Lines with one call per line.
+        """
+        with open(path, encoding="utf-8") as file:
+            text = file.read()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = [json.loads(line) for line in text.splitlines() if line.strip()]
+        if isinstance(data, dict):
+            data = data.get("calls", [])
+        return cls.from_calls(data)
+
+    def dump(self, path: str) -> None:
+        """Write the calls to a file as JSON Lines."""
+        with open(path, "w", encoding="utf-8") as file:
+            for call in self.calls():
+                file.write(json.dumps(call) + "\n")
+
+    @classmethod
+    def uniform(
+        cls, calls: int, days: float = 30, lines: int = 20, seed: int = 0
+    ) -> "CallLog":
+        """Build a call log spread evenly over the last days."""
+        rng = random.Random(seed)
+        now = time.time()
+        starts = sorted(now - rng.uniform(0, days * 86400) for _ in range(calls))
+
+        log = cls()
+        for start in starts:
+            direction = rng.choices((0, 1, 2), weights=(6, 3, 1))[0]
+            duration = 0 if direction == 2 else int(rng.lognormvariate(4.5, 1))
+            line = rng.randrange(lines)
+            queue = rng.randrange(4) if direction != 1 and rng.random() < 0.3 else -1
+            log.append(
+                start,
+                duration,
+                direction,
+                f"line-{line}",
+                f"user-{line}",
+                f"queue-{queue}" if queue >= 0 else None,
+            )
+        return log
+
+
+class MockGoToApi:
+    """aiohttp application faking the GoTo Connect endpoints."""
+
+    def __init__(
+        self,
+        call_log: CallLog,
+        page_size: int = 1000,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.1,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the mock."""
+        self.call_log = call_log
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.requests: Counter = Counter()
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._tokens_issued = 0
+        # Open notification channels by ID, with their subscribed accounts
+        # and connected websockets
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.channels_created = 0
+        self.channels_renewed = 0
+        self.channels_deleted = 0
+
+    def build_app(self) -> web.Application:
+        """Return the aiohttp application serving the mock."""
+        app = web.Application()
+        app.router.add_get(CALLS_API_URL, self._handle_calls)
+        app.router.add_get(USERS_API_URL, self._handle_me)
+        app.router.add_post(TOKEN_PATH, self._handle_token)
+        app.router.add_get(STATS_PATH, self._handle_stats)
+
+        channel = f"{NOTIFICATION_CHANNEL_API_URL}/{{nickname}}/{{channel_id}}"
+        app.router.add_post(
+            f"{NOTIFICATION_CHANNEL_API_URL}/{{nickname}}", self._handle_create_channel
+        )
+        app.router.add_put(f"{channel}/channel-lifetime", self._handle_renew_channel)
+        app.router.add_delete(channel, self._handle_delete_channel)
+        app.router.add_post(CALL_EVENTS_SUBSCRIPTIONS_API_URL, self._handle_subscribe)
+        app.router.add_get(
+            f"{CHANNEL_SOCKET_PATH}/{{channel_id}}", self._handle_channel_socket
+        )
+        return app
+
+    async def async_publish(self, row: int) -> int:
+        """Send the ended call event of a call to the subscribed channels.
+
+        Returns the number of websockets it was sent to.
+        """
+        message = json.dumps(self.call_log.as_event(row))
+        sent = 0
+        for channel in self.channels.values():
+            if not channel["accounts"]:
+                continue
+            for ws in list(channel["sockets"]):
+                await ws.send_str(message)
+                sent += 1
+        return sent
+
+    async def async_drop_sockets(self) -> int:
+        """Close every channel websocket, as a flaky network would.
+
+        Returns the number of websockets closed.
+        """
+        sockets = [
+            ws for channel in self.channels.values() for ws in channel["sockets"]
+        ]
+        for ws in sockets:
+            await ws.close(code=WSCloseCode.GOING_AWAY)
+        return len(sockets)
+
+    async def async_expire_channels(self) -> int:
+        """Forget every channel, as when their lifetime runs out.
+
+        Returns the number of channels expired.
+        """
+        await self.async_drop_sockets()
+        expired = len(self.channels)
+        self.channels.clear()
+        return expired
+
+    def connected_sockets(self) -> int:
+        """Return the number of connected channel websockets."""
+        return sum(len(channel["sockets"]) for channel in self.channels.values())
+
+    async def _respond(self, path: str) -> Optional[web.Response]:
+        """Count a request, apply latency and maybe throttle it."""
+        self.requests[path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.throttle_rate and self._rng.random() < self.throttle_rate:
+            self.throttled += 1
+            return web.Response(
+                status=429, headers={"Retry-After": str(self.retry_after)}
+            )
+        return None
+
+    async def _handle_calls(self, request: web.Request) -> web.Response:
+        """Serve one page of the calls between startTime and endTime."""
+        if (throttled := await self._respond(CALLS_API_URL)) is not None:
+            return throttled
+
+        query = request.query
+        log = self.call_log
+        first = bisect_left(log.start, parse_api_time(query["startTime"]))
+        end = bisect_left(log.start, parse_api_time(query["endTime"]))
+        page_size = min(int(query.get("pageSize", self.page_size)), self.page_size)
+        row = max(first, int(query.get(CALLS_PAGE_MARKER_PARAM, first)))
+        last = min(end, row + page_size)
+
+        body: Dict[str, Any] = {"calls": [log.as_call(i) for i in range(row, last)]}
+        if last < end:
+            body[CALLS_NEXT_PAGE_MARKER] = str(last)
+        return web.json_response(body)
+
+    async def _handle_me(self, request: web.Request) -> web.Response:
+        """Serve the current user, honouring If-None-Match."""
+        if (throttled := await self._respond(USERS_API_URL)) is not None:
+            return throttled
+
+        etag = '"benchmark-user"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response(
+            {"accountKey": "benchmark", "firstName": "Bench", "lastName": "Mark"},
+            headers={"ETag": etag},
+        )
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue a fresh access token for any refresh token."""
+        self.requests[TOKEN_PATH] += 1
+        self._tokens_issued += 1
+        return web.json_response(
+            {
+                "access_token": f"benchmark-{self._tokens_issued}",
+                "refresh_token": "benchmark-refresh",
+                "expires_in": 3600,
+            }
+        )
+
+    async def _handle_create_channel(self, request: web.Request) -> web.Response:
+        """Open a notification channel with a websocket URL on this server."""
+        self.requests[NOTIFICATION_CHANNEL_API_URL] += 1
+        channel_id = uuid.uuid4().hex
+        self.channels[channel_id] = {"accounts": set(), "sockets": set()}
+        self.channels_created += 1
+        url = request.url.with_scheme("ws").with_path(
+            f"{CHANNEL_SOCKET_PATH}/{channel_id}"
+        )
+        return web.json_response(
+            {
+                "channelId": channel_id,
+                "channelNickname": request.match_info["nickname"],
+                "channelData": {"channelURL": str(url), "channelType": "WebSockets"},
+                "channelLifetime": CHANNEL_LIFETIME,
+            },
+            status=201,
+        )
+
+    async def _handle_renew_channel(self, request: web.Request) -> web.Response:
+        """Extend the lifetime of a notification channel."""
+        self.requests[NOTIFICATION_CHANNEL_API_URL] += 1
+        if request.match_info["channel_id"] not in self.channels:
+            raise web.HTTPNotFound()
+        self.channels_renewed += 1
+        return web.json_response({"channelLifetime": CHANNEL_LIFETIME})
+
+    async def _handle_delete_channel(self, request: web.Request) -> web.Response:
+        """Delete a notification channel, its subscriptions and websockets."""
+        self.requests[NOTIFICATION_CHANNEL_API_URL] += 1
+        channel = self.channels.pop(request.match_info["channel_id"], None)
+        if channel is None:
+            raise web.HTTPNotFound()
+        self.channels_deleted += 1
+        for ws in list(channel["sockets"]):
+            await ws.close(code=WSCloseCode.GOING_AWAY)
+        return web.Response(status=204)
+
+    async def _handle_subscribe(self, request: web.Request) -> web.Response:
+        """Subscribe accounts to call events on a notification channel."""
+        self.requests[CALL_EVENTS_SUBSCRIPTIONS_API_URL] += 1
+        body = await request.json()
+        channel = self.channels.get(body.get("channelId"))
+        if channel is None:
+            raise web.HTTPNotFound()
+        account_keys = body.get("accountKeys", [])
+        channel["accounts"].update(account["id"] for account in account_keys)
+        return web.json_response(
+            {
+                "accountKeys": [
+                    {"id": account["id"], "status": 201} for account in account_keys
+                ]
+            }
+        )
+
+    async def _handle_channel_socket(
+        self, request: web.Request
+    ) -> web.WebSocketResponse:
+        """Hold a channel websocket open until either side closes it."""
+        channel = self.channels.get(request.match_info["channel_id"])
+        if channel is None:
+            raise web.HTTPNotFound()
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sockets: Set[web.WebSocketResponse] = channel["sockets"]
+        sockets.add(ws)
+        try:
+            async for _message in ws:
+                pass
+        finally:
+            sockets.discard(ws)
+        return ws
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        """Return the request and channel counters."""
+        return web.json_response(
+            {
+                "calls": len(self.call_log),
+                "requests": dict(self.requests),
+                "throttled": self.throttled,
+                "channels_open": len(self.channels),
+                "channels_created": self.channels_created,
+                "channels_renewed": self.channels_renewed,
+                "channels_deleted": self.channels_deleted,
+            }
+        )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock API options to a command line parser."""
+    parser.add_argument("--calls", type=int, default=10000, help="calls in the log")
+    parser.add_argument("--days", type=float, default=30, help="days the calls span")
+    parser.add_argument("--lines", type=int, default=20, help="distinct lines")
+    parser.add_argument("--page-size", type=int, default=1000, help="max calls per page")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="share of requests answered 429"
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=0.1, help="Retry-After of 429 responses"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--calls-file",
+        help="serve recorded or generated calls from this file instead",
+    )
+
+
+def main() -> None:
+    """Serve the mock API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.calls_file:
+        call_log = CallLog.load(args.calls_file)
+    else:
+        call_log = CallLog.uniform(args.calls, args.days, args.lines, args.seed)
+    _LOGGER.info("Serving %d calls on %s:%d", len(call_log), args.host, args.port)
+    api = MockGoToApi(
+        call_log,
+        page_size=args.page_size,
+        latency=args.latency,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    web.run_app(api.build_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
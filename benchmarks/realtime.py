@@ -0,0 +1,178 @@
+"""Drive the call event listener end to end against the mock API.
+
+The real listener creates a notification channel on the mock, subscribes
+to call events and consumes ended calls pushed over the websocket, while
+the mock drops, expires and renews the channel under it. Each step is a
+check, and the run exits non-zero if any fails:
+
+    python -m benchmarks.realtime --calls 20 --drops 3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from aiohttp import web
+
+from custom_components.goto_connect_call_stats.aggregator import from_timestamp
+from custom_components.goto_connect_call_stats.const import (
+    NOTIFICATION_CHANNEL_RENEW_MARGIN,
+    SYNC_OVERLAP,
+)
+from custom_components.goto_connect_call_stats.realtime import GoToCallEventListener
+
+from .harness import async_coordinator
+from .mock_api import CallLog, MockGoToApi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _async_wait(condition: Callable[[], bool], timeout: float) -> bool:
+    """Wait until the condition holds, returning False on timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+async def async_check(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the listener against the mock and collect the checks."""
+    log = CallLog()
+    api = MockGoToApi(log)
+    runner = web.AppRunner(api.build_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = "http://127.0.0.1:%d" % runner.addresses[0][1]
+
+    checks: Dict[str, bool] = {}
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with async_coordinator(
+                config_dir, base_url, options={"adaptive_polling": False}
+            ) as (hass, coordinator):
+                # Brings the token and the account key to subscribe for
+                await coordinator.async_refresh()
+
+                def today_total() -> int:
+                    return (coordinator.data or {}).get("today", {}).get("total", 0)
+
+                def connected() -> bool:
+                    return api.connected_sockets() == 1
+
+                listener = GoToCallEventListener(
+                    hass, coordinator, api_base_url=base_url
+                )
+                listener.async_start()
+                try:
+                    checks["subscribed"] = await _async_wait(connected, args.timeout)
+
+                    # A call longer than the sync overlap, then short ones,
+                    # all ended by now
+                    now = time.time()
+                    log.append(now - SYNC_OVERLAP - args.long_call, args.long_call, 0)
+                    for index in range(args.calls):
+                        log.append(now - 60 + index, 30, index % 3, f"line-{index % 3}")
+                    for row in range(len(log)):
+                        await api.async_publish(row)
+                    checks["pushed_calls_counted"] = await _async_wait(
+                        lambda: today_total() == len(log), args.timeout
+                    )
+
+                    for _ in range(args.drops):
+                        await api.async_drop_sockets()
+                        await asyncio.sleep(0.1)
+                        if not await _async_wait(connected, args.timeout):
+                            break
+                    checks["channel_kept_across_reconnects"] = (
+                        connected() and api.channels_created == 1
+                    )
+
+                    # Due for renewal: the next reconnect extends the channel
+                    listener._channel["expires"] = (
+                        hass.loop.time() + NOTIFICATION_CHANNEL_RENEW_MARGIN - 1
+                    )
+                    await api.async_drop_sockets()
+                    checks["channel_renewed"] = (
+                        await _async_wait(connected, args.timeout)
+                        and api.channels_renewed == 1
+                        and api.channels_created == 1
+                    )
+
+                    # Expired server side: the channel is created again
+                    await api.async_expire_channels()
+                    checks["expired_channel_recreated"] = (
+                        await _async_wait(connected, args.timeout)
+                        and api.channels_created == 2
+                        and len(api.channels) == 1
+                    )
+
+                    # The sync range ends on a whole second
+                    await asyncio.sleep(1)
+                    await coordinator.async_refresh()
+                    stored, _ = await coordinator._store.async_load(
+                        from_timestamp(now - 2 * SYNC_OVERLAP - args.long_call)
+                    )
+                    checks["poll_confirms_pushed_calls"] = (
+                        coordinator._ledger.earliest_provisional() is None
+                        and len(stored) == len(log)
+                    )
+                    checks["no_double_count"] = today_total() == len(log)
+                finally:
+                    await listener.async_stop()
+                checks["channel_deleted_on_stop"] = (
+                    not api.channels and api.connected_sockets() == 0
+                )
+    finally:
+        await runner.cleanup()
+
+    return {
+        "benchmark": "realtime",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "calls": args.calls,
+            "long_call": args.long_call,
+            "drops": args.drops,
+        },
+        "checks": checks,
+        "passed": all(checks.values()),
+        "requests": dict(api.requests),
+        "channels_created": api.channels_created,
+        "channels_renewed": api.channels_renewed,
+        "channels_deleted": api.channels_deleted,
+    }
+
+
+def main() -> None:
+    """Run the checks and print the JSON result."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20, help="short calls to push")
+    parser.add_argument(
+        "--long-call",
+        type=int,
+        default=2 * SYNC_OVERLAP,
+        help="talk time of the call longer than the sync overlap (seconds)",
+    )
+    parser.add_argument("--drops", type=int, default=3, help="websocket drops")
+    parser.add_argument(
+        "--timeout", type=float, default=10, help="seconds to wait for each step"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    result = asyncio.run(async_check(args))
+    print(json.dumps(result, indent=2))
+    if not result["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Replay call traffic into the coordinator at accelerated speed.
+
+Calls from a recorded or generated log are released in start time order,
+compressed by --speed, and either served by an in-process mock API for
+the coordinator to poll or pushed straight into it the way the call
+event channel does. Each call is moved to the wall time it is released
+at, so the incremental sync sees it as a new call, and ends up in
+today's statistics. The result is printed as JSON:
+
+    python -m benchmarks.replay --days 1 --speed 1440 --mode poll
+    python -m benchmarks.replay --input calls.jsonl --speed 600 --mode push
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import tempfile
+import time
+from bisect import bisect_right
+from typing import Any, Dict, List, Set, Tuple
+
+from aiohttp import web
+
+from .generator import TrafficGenerator, add_arguments, profile_from_args
+from .harness import AggregationTimer, async_coordinator, peak_rss_mb
+from .mock_api import CallLog, MockGoToApi
+
+_LOGGER = logging.getLogger(__name__)
+
+MODE_POLL = "poll"
+MODE_PUSH = "push"
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Return a percentile of the values by nearest rank."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+def _new_groups(data: Dict[str, Any], known: Set[Tuple[str, str]]) -> int:
+    """Count the groups a sensor platform would add a sensor for."""
+    added = 0
+    for dimension, group_stats in (data or {}).get("groups", {}).items():
+        for group_id in group_stats:
+            if (dimension, group_id) not in known:
+                known.add((dimension, group_id))
+                added += 1
+    return added
+
+
+async def async_replay(args: argparse.Namespace, source: CallLog) -> Dict[str, Any]:
+    """Replay the source log into a coordinator and collect metrics."""
+    live = CallLog()
+    api = MockGoToApi(live, page_size=args.page_size)
+    runner = web.AppRunner(api.build_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = "http://127.0.0.1:%d" % runner.addresses[0][1]
+
+    latencies: List[float] = []
+    batches: List[int] = []
+    known_groups: Set[Tuple[str, str]] = set()
+    churn: List[int] = []
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with async_coordinator(
+                config_dir, base_url, options={"adaptive_polling": False}, rate=args.rate
+            ) as (hass, coordinator):
+                # Cold sync of the empty log, which also fetches a token
+                await coordinator.async_refresh()
+                timer = AggregationTimer(coordinator)
+
+                first = source.start[0]
+                started = time.time()
+                row = 0
+                while row < len(source):
+                    await asyncio.sleep(args.tick)
+                    elapsed = time.time() - started
+                    if args.max_seconds and elapsed > args.max_seconds:
+                        break
+
+                    end = bisect_right(source.start, first + elapsed * args.speed, row)
+                    live_row = len(live)
+                    for source_row in range(row, end):
+                        offset = (source.start[source_row] - first) / args.speed
+                        live.append_row(source, source_row, started + offset)
+                    row = end
+
+                    tick_started = time.perf_counter()
+                    if args.mode == MODE_PUSH:
+                        if live_row == len(live):
+                            continue
+                        await coordinator.async_ingest_calls(
+                            [live.as_call(i) for i in range(live_row, len(live))]
+                        )
+                    else:
+                        await coordinator.async_refresh()
+                    latencies.append(time.perf_counter() - tick_started)
+                    batches.append(len(live) - live_row)
+                    churn.append(_new_groups(coordinator.data, known_groups))
+
+                wall = time.time() - started
+                if args.mode == MODE_POLL:
+                    # The sync range ends on a whole second; one more poll
+                    # picks up calls released within the last one
+                    await asyncio.sleep(1)
+                    await coordinator.async_refresh()
+                data = coordinator.data or {}
+                aggregation_cpu = timer.take()
+    finally:
+        await runner.cleanup()
+
+    replayed_span = source.start[row - 1] - source.start[0] if row else 0.0
+    return {
+        "benchmark": "replay",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "mode": args.mode,
+            "speed": args.speed,
+            "tick": args.tick,
+            "input": args.input,
+            "calls_in_source": len(source),
+            "seed": args.seed,
+            "end": args.end,
+        },
+        "replayed_calls": row,
+        "replayed_span_s": round(replayed_span, 1),
+        "wall_s": round(wall, 2),
+        "achieved_speed": round(replayed_span / wall, 1) if wall else None,
+        "ticks": len(latencies),
+        "calls_per_tick": {
+            "mean": round(statistics.fmean(batches), 1) if batches else 0,
+            "max": max(batches, default=0),
+        },
+        "tick_latency_s": {
+            "p50": round(_percentile(latencies, 50), 4),
+            "p95": round(_percentile(latencies, 95), 4),
+            "max": round(max(latencies, default=0.0), 4),
+        },
+        "aggregation_cpu_s": round(aggregation_cpu, 4),
+        "requests": dict(api.requests),
+        "group_sensors": {
+            "total": len(known_groups),
+            "ticks_adding": sum(1 for added in churn if added),
+        },
+        "today_total": data.get("today", {}).get("total"),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    """Replay traffic and print or write the JSON result."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--input", help="recorded or generated calls to replay")
+    parser.add_argument(
+        "--days", type=float, default=1, help="days of traffic to generate without --input"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=600, help="replayed seconds per wall second"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=(MODE_POLL, MODE_PUSH),
+        default=MODE_POLL,
+        help="poll the mock API or push calls like the call event channel",
+    )
+    parser.add_argument(
+        "--tick", type=float, default=1.0, help="wall seconds between polls or pushes"
+    )
+    parser.add_argument(
+        "--max-seconds", type=float, default=0, help="stop after this many wall seconds"
+    )
+    parser.add_argument("--page-size", type=int, default=1000, help="max calls per page")
+    parser.add_argument(
+        "--rate", type=float, default=1000, help="client request rate limit (per second)"
+    )
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.input:
+        source = CallLog.load(args.input)
+    else:
+        source = TrafficGenerator(profile_from_args(args), args.seed).generate(
+            args.days, args.end
+        )
+    if not len(source):
+        parser.error("no calls to replay")
+
+    result = asyncio.run(async_replay(args, source))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
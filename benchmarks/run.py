@@ -0,0 +1,176 @@
+"""Poll benchmark for the GoTo Connect Call Stats coordinator.
+
+Starts the mock GoTo API in a child process, drives the coordinator
+through a cold full sync and a number of warm incremental polls, and
+prints the results as JSON:
+
+    python -m benchmarks.run --calls 100000 --polls 3 --output result.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+
+from .harness import AggregationTimer, async_coordinator, async_timed_refresh, peak_rss_mb
+from .mock_api import STATS_PATH, add_arguments
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _free_port() -> int:
+    """Return a TCP port that is free on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _async_mock_stats(session: aiohttp.ClientSession, base_url: str) -> Dict[str, Any]:
+    """Return the mock API's request counters."""
+    async with session.get(f"{base_url}{STATS_PATH}") as response:
+        return await response.json()
+
+
+async def _async_wait_for_mock(base_url: str, process: subprocess.Popen) -> None:
+    """Wait until the mock API answers, generating a large log takes a while."""
+    async with aiohttp.ClientSession() as session:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError("Mock GoTo API exited during startup")
+            try:
+                await _async_mock_stats(session, base_url)
+                return
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(0.2)
+
+
+def _requests_between(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, int]:
+    """Return the requests made per endpoint between two counter snapshots."""
+    return {
+        path: count - before["requests"].get(path, 0)
+        for path, count in after["requests"].items()
+        if count != before["requests"].get(path, 0)
+    }
+
+
+async def async_run(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    """Poll the coordinator against the mock API and collect metrics."""
+    polls: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_coordinator(
+            config_dir, base_url, options={"adaptive_polling": False}, rate=args.rate
+        ) as (hass, coordinator), aiohttp.ClientSession() as session:
+            timer = AggregationTimer(coordinator)
+            for poll in range(args.polls):
+                before = await _async_mock_stats(session, base_url)
+                latency = await async_timed_refresh(coordinator)
+                after = await _async_mock_stats(session, base_url)
+
+                requests = _requests_between(before, after)
+                polls.append(
+                    {
+                        "poll": poll + 1,
+                        "kind": "cold" if poll == 0 else "warm",
+                        "success": coordinator.last_update_success,
+                        "latency_s": round(latency, 4),
+                        "requests": sum(requests.values()),
+                        "requests_by_endpoint": requests,
+                        "throttled": after["throttled"] - before["throttled"],
+                        "aggregation_cpu_s": round(timer.take(), 4),
+                        "calls_held": len(coordinator._ledger),
+                        "month_total": (coordinator.data or {})
+                        .get("month", {})
+                        .get("total"),
+                    }
+                )
+
+    return {
+        "benchmark": "poll",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "calls": args.calls,
+            "days": args.days,
+            "page_size": args.page_size,
+            "latency": args.latency,
+            "throttle_rate": args.throttle_rate,
+            "polls": args.polls,
+            "rate": args.rate,
+            "seed": args.seed,
+            "calls_file": args.calls_file,
+        },
+        "polls": polls,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print or write its JSON result."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--polls", type=int, default=3, help="polls to run")
+    parser.add_argument(
+        "--rate", type=float, default=1000, help="client request rate limit (per second)"
+    )
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    # The mock runs in its own process so its memory and CPU are not measured
+    mock = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.mock_api",
+            "--port",
+            str(port),
+            "--calls",
+            str(args.calls),
+            "--days",
+            str(args.days),
+            "--lines",
+            str(args.lines),
+            "--page-size",
+            str(args.page_size),
+            "--latency",
+            str(args.latency),
+            "--throttle-rate",
+            str(args.throttle_rate),
+            "--retry-after",
+            str(args.retry_after),
+            "--seed",
+            str(args.seed),
+            *(["--calls-file", args.calls_file] if args.calls_file else []),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(_async_wait_for_mock(base_url, mock))
+        result = asyncio.run(async_run(args, base_url))
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,27 +8,53 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END_DATE,
+    ATTR_START_DATE,
+    CONF_METRICS_ENDPOINT,
+    CONF_REALTIME,
+    DEFAULT_METRICS_ENDPOINT,
+    DEFAULT_REALTIME,
     DOMAIN,
     PLATFORMS,
+    SERVICE_BACKFILL,
 )
 from .coordinator import GoToConnectCallStatsCoordinator
+from .exporter import get_metrics_registry
+from .oauth import DATA_OAUTH_MANAGERS
+from .realtime import GoToCallEventListener
+from .store import GoToCallStore
 
 _LOGGER = logging.getLogger(__name__)
 
 # No YAML configuration support - UI only
 
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up GoTo Connect Call Stats from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    await _async_migrate_registry(hass, entry)
 
     coordinator = GoToConnectCallStatsCoordinator(hass, entry)
+    # Release the shared connection pool and close the call store whenever
+    # the entry unloads, including after a failed setup
+    entry.async_on_unload(coordinator.async_cleanup)
     await coordinator.async_config_entry_first_refresh()
 
     if not coordinator.last_update_success:
@@ -38,12 +64,101 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if entry.options.get(CONF_REALTIME, DEFAULT_REALTIME):
+        listener = GoToCallEventListener(hass, coordinator)
+        listener.async_start()
+        entry.async_on_unload(listener.async_stop)
+
+    if entry.options.get(CONF_METRICS_ENDPOINT, DEFAULT_METRICS_ENDPOINT):
+        entry.async_on_unload(get_metrics_registry(hass).async_register(coordinator))
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    _async_register_services(hass)
+    await coordinator.backfill.async_resume()
+
     return True
 
 
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services once for every entry."""
+    if hass.services.has_service(DOMAIN, SERVICE_BACKFILL):
+        return
+
+    async def _async_backfill(call: ServiceCall) -> None:
+        """Start backfilling past calls of one or every config entry."""
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE) or dt_util.now().date()
+        if start > end:
+            raise HomeAssistantError(f"Backfill start {start} is after its end {end}")
+
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        coordinators = [
+            coordinator
+            for key, coordinator in hass.data.get(DOMAIN, {}).items()
+            if isinstance(coordinator, GoToConnectCallStatsCoordinator)
+            and entry_id in (None, key)
+        ]
+        if not coordinators:
+            raise HomeAssistantError(
+                f"Config entry {entry_id} is not loaded"
+                if entry_id
+                else "No GoTo Connect account is loaded"
+            )
+        for coordinator in coordinators:
+            await coordinator.backfill.async_start(start, end)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, _async_backfill, schema=BACKFILL_SCHEMA
+    )
+
+
+async def _async_migrate_registry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Key entities and the device by config entry instead of by domain.
+
+    Unique IDs used to be prefixed with the domain, so they collided as
+    soon as a second account was added.
+    """
+    old_prefix = f"{DOMAIN}_"
+
+    @callback
+    def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, Any] | None:
+        """Return the per-entry unique ID of an entity keyed by domain."""
+        if not entity_entry.unique_id.startswith(old_prefix):
+            return None
+        suffix = entity_entry.unique_id[len(old_prefix):]
+        return {"new_unique_id": f"{entry.entry_id}_{suffix}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, DOMAIN)})
+    if device is not None and entry.entry_id in device.config_entries:
+        device_registry.async_update_device(
+            device.id, new_identifiers={(DOMAIN, entry.entry_id)}
+        )
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not any(
+            isinstance(value, GoToConnectCallStatsCoordinator)
+            for value in hass.data[DOMAIN].values()
+        ):
+            hass.services.async_remove(DOMAIN, SERVICE_BACKFILL)
+
+    return unload_ok
+
 
-    return unload_ok 
\ No newline at end of file
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached tokens and local call store of a deleted entry."""
+    hass.data.get(DOMAIN, {}).get(DATA_OAUTH_MANAGERS, {}).pop(entry.entry_id, None)
+    await GoToCallStore(hass, entry.entry_id).async_remove() 
\ No newline at end of file
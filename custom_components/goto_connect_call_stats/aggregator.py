@@ -0,0 +1,671 @@
+"""Call aggregation for GoTo Connect Call Stats integration."""
+
+import heapq
+import logging
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .const import (
+    DURATION_HISTOGRAM_BOUNDS,
+    DURATION_PERCENTILES,
+    GROUP_LINE,
+    GROUP_QUEUE,
+    GROUP_USER,
+    PERIOD_ALIGNMENT_CALENDAR,
+    PERIOD_MONTH,
+    PERIOD_TODAY,
+    PERIOD_WEEK,
+    ROLLING_MONTH_DAYS,
+    ROLLING_WEEK_DAYS,
+    SYNC_OVERLAP,
+)
+from .sketch import DDSketch
+
+_LOGGER = logging.getLogger(__name__)
+
+DIRECTION_INCOMING = "incoming"
+DIRECTION_OUTGOING = "outgoing"
+DIRECTION_MISSED = "missed"
+DIRECTION_OTHER = "other"
+
+_EPOCH = datetime(1970, 1, 1)
+
+# How far (seconds) a re-fetched call's start time may have moved
+_MOVE_SLACK = 60
+
+# Call fields each breakdown dimension groups by
+GROUP_FIELDS = {
+    GROUP_LINE: "lineId",
+    GROUP_USER: "userKey",
+    GROUP_QUEUE: "queueId",
+}
+
+# Histogram bucket labels, one per bound plus the overflow bucket
+DURATION_HISTOGRAM_LABELS = [f"le_{bound}s" for bound in DURATION_HISTOGRAM_BOUNDS] + [
+    f"gt_{DURATION_HISTOGRAM_BOUNDS[-1]}s"
+]
+
+# Compact codes used in the direction column
+DIRECTION_CODES = {
+    DIRECTION_OTHER: 0,
+    DIRECTION_INCOMING: 1,
+    DIRECTION_OUTGOING: 2,
+    DIRECTION_MISSED: 3,
+}
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Return an ISO 8601 timestamp as a naive UTC datetime."""
+    if not value:
+        return None
+
+    try:
+        timestamp = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        _LOGGER.debug("Ignoring unparsable timestamp: %s", value)
+        return None
+
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def parse_call_start(call: Dict[str, Any]) -> Optional[datetime]:
+    """Return the start time of a call as a naive UTC datetime."""
+    return parse_timestamp(call.get("startTime"))
+
+
+def classify_call(call: Dict[str, Any]) -> str:
+    """Return the direction of a raw call."""
+    # The decoder forwards nulls, so a present field may still be None
+    call_type = str(call.get("type") or "").lower()
+
+    if "incoming" in call_type or "inbound" in call_type:
+        return DIRECTION_INCOMING
+    if "outgoing" in call_type or "outbound" in call_type:
+        return DIRECTION_OUTGOING
+    if "missed" in call_type:
+        return DIRECTION_MISSED
+    return DIRECTION_OTHER
+
+
+def parse_duration(value: Any) -> int:
+    """Return a call duration in whole seconds, 0 if missing or invalid."""
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError, ArithmeticError):
+        _LOGGER.debug("Ignoring invalid call duration: %s", value)
+        return 0
+
+
+def empty_stats() -> Dict[str, Any]:
+    """Return empty statistics structure."""
+    return {
+        "total": 0,
+        "incoming": 0,
+        "outgoing": 0,
+        "missed": 0,
+        "answered": 0,
+        "total_duration": 0,
+        "average_duration": 0,
+        "duration_percentiles": {
+            f"p{percentile}": None for percentile in DURATION_PERCENTILES
+        },
+        "duration_histogram": dict.fromkeys(DURATION_HISTOGRAM_LABELS, 0),
+    }
+
+
+def to_timestamp(value: datetime) -> float:
+    """Convert a naive UTC datetime to a POSIX timestamp."""
+    return (value - _EPOCH).total_seconds()
+
+
+def from_timestamp(value: float) -> datetime:
+    """Convert a POSIX timestamp to a naive UTC datetime."""
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a naive UTC datetime the way the GoTo API expects it."""
+    return value.replace(microsecond=0).isoformat() + "Z"
+
+
+def local_midnight(day: date, time_zone: tzinfo) -> datetime:
+    """Return the start of a local day as a naive UTC datetime."""
+    start = datetime.combine(day, time(), tzinfo=time_zone)
+    return start.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def period_start_days(today: date, alignment: str) -> Dict[str, date]:
+    """Return the first local day of every statistics period.
+
+    Calendar periods start on Monday and on the first of the month;
+    rolling periods cover a fixed number of days up to and including
+    today.
+    """
+    if alignment == PERIOD_ALIGNMENT_CALENDAR:
+        week_start = today - timedelta(days=today.weekday())
+        month_start = today.replace(day=1)
+    else:
+        week_start = today - timedelta(days=ROLLING_WEEK_DAYS - 1)
+        month_start = today - timedelta(days=ROLLING_MONTH_DAYS - 1)
+    return {PERIOD_TODAY: today, PERIOD_WEEK: week_start, PERIOD_MONTH: month_start}
+
+
+class CallRecord(NamedTuple):
+    """The fields of a call that the statistics are built from."""
+
+    call_id: str
+    start: datetime
+    duration: int
+    direction: str
+    line_id: Optional[str] = None
+    user_key: Optional[str] = None
+    queue_id: Optional[str] = None
+
+    @classmethod
+    def from_call(cls, call: Dict[str, Any]) -> Optional["CallRecord"]:
+        """Build a record from a raw call, or None if it has no start time."""
+        start = parse_call_start(call)
+        if start is None:
+            return None
+
+        duration = parse_duration(call.get("duration"))
+        call_id = call.get("id") or (
+            f"{call.get('startTime')}|{call.get('type', '')}|{duration}"
+        )
+        line_id, user_key, queue_id = (
+            str(call[field]) if call.get(field) else None
+            for field in GROUP_FIELDS.values()
+        )
+        return cls(
+            str(call_id),
+            start,
+            duration,
+            classify_call(call),
+            line_id,
+            user_key,
+            queue_id,
+        )
+
+    @property
+    def groups(self) -> Tuple[Tuple[str, str], ...]:
+        """Return the (dimension, group) pairs the call belongs to."""
+        return tuple(
+            (dimension, value)
+            for dimension, value in zip(
+                GROUP_FIELDS, (self.line_id, self.user_key, self.queue_id)
+            )
+            if value is not None
+        )
+
+
+class CallColumns:
+    """Calls held as parallel typed arrays sorted by start time.
+
+    A call costs 25 bytes here: its start timestamp, duration, direction
+    code, the code of the groups it belongs to and a 64-bit hash of its
+    ID. With the day rollups of the account and of every group, a month
+    of 100,000 calls on 50 lines costs about 85 bytes a call in all.
+
+    A call is found again by its start time and ID hash. The ledger only
+    indexes the start times of the calls that may come back with another
+    one, those in the sync overlap and pushed calls.
+    """
+
+    __slots__ = ("start", "duration", "direction", "groups", "key")
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.start = array("d")
+        self.duration = array("i")
+        self.direction = bytearray()
+        self.groups = array("i")
+        self.key = array("q")
+
+    def __len__(self) -> int:
+        """Return the number of calls held."""
+        return len(self.start)
+
+    def find(self, start: float, key: int) -> int:
+        """Return the row of a call, or -1 if it is not held."""
+        row = bisect_left(self.start, start)
+        while row < len(self.start) and self.start[row] == start:
+            if self.key[row] == key:
+                return row
+            row += 1
+        return -1
+
+    def delete(self, row: int) -> None:
+        """Delete the call in a row."""
+        del self.start[row]
+        del self.key[row]
+        del self.duration[row]
+        del self.direction[row]
+        del self.groups[row]
+
+    def append(
+        self, start: float, key: int, duration: int, direction: int, groups: int
+    ) -> None:
+        """Append a call that starts no earlier than the last one held."""
+        self.start.append(start)
+        self.key.append(key)
+        self.duration.append(duration)
+        self.direction.append(direction)
+        self.groups.append(groups)
+
+    def drop_before(self, start: float) -> array:
+        """Drop every call that started before a timestamp; return their keys."""
+        rows = bisect_left(self.start, start)
+        keys = self.key[:rows]
+        if rows:
+            del self.start[:rows]
+            del self.key[:rows]
+            del self.duration[:rows]
+            del self.direction[:rows]
+            del self.groups[:rows]
+        return keys
+
+
+class DayRollup:
+    """Precomputed statistics of the calls of one local day.
+
+    Calls are added and removed as they are merged or corrected, so the
+    statistics of a period are the sum of the rollups of its days.
+    """
+
+    __slots__ = ("directions", "answered", "total_duration", "sketch")
+
+    def __init__(self) -> None:
+        """Initialize an empty rollup."""
+        self.directions = [0] * len(DIRECTION_CODES)
+        self.answered = 0
+        self.total_duration = 0
+        self.sketch = DDSketch()
+
+    def add(self, duration: int, direction: int) -> None:
+        """Count a call."""
+        self.directions[direction] += 1
+        # Calls without talk time do not count towards the duration stats
+        if duration > 0:
+            self.answered += 1
+            self.total_duration += duration
+            self.sketch.add(duration)
+
+    def remove(self, duration: int, direction: int) -> None:
+        """Stop counting a call that was previously added."""
+        self.directions[direction] -= 1
+        if duration > 0:
+            self.answered -= 1
+            self.total_duration -= duration
+            self.sketch.remove(duration)
+
+    def merge(self, other: "DayRollup") -> None:
+        """Add the statistics of another rollup."""
+        for code, count in enumerate(other.directions):
+            self.directions[code] += count
+        self.answered += other.answered
+        self.total_duration += other.total_duration
+        self.sketch.merge(other.sketch)
+
+    def as_stats(self) -> Dict[str, Any]:
+        """Return the rollup in the statistics structure."""
+        sketch = self.sketch
+        stats = empty_stats()
+        stats.update(
+            {
+                "total": sum(self.directions),
+                "incoming": self.directions[DIRECTION_CODES[DIRECTION_INCOMING]],
+                "outgoing": self.directions[DIRECTION_CODES[DIRECTION_OUTGOING]],
+                "missed": self.directions[DIRECTION_CODES[DIRECTION_MISSED]],
+                "answered": self.answered,
+                "total_duration": self.total_duration,
+                "average_duration": (
+                    self.total_duration / self.answered if self.answered else 0
+                ),
+                "duration_percentiles": {
+                    f"p{percentile}": sketch.quantile(percentile / 100)
+                    for percentile in DURATION_PERCENTILES
+                },
+                "duration_histogram": dict(
+                    zip(
+                        DURATION_HISTOGRAM_LABELS,
+                        sketch.histogram(DURATION_HISTOGRAM_BOUNDS),
+                    )
+                ),
+            }
+        )
+        return stats
+
+
+class CallLedger:
+    """Running set of synced calls, deduplicated by call ID.
+
+    The ledger remembers how far the calls endpoint has been synced so a
+    poll only needs to fetch calls newer than the high-water mark. Calls
+    seen again in the overlap replace their previous values, start time
+    included.
+
+    Calls pushed by the call event channel are provisional: they are
+    counted but not saved until the calls endpoint returns them, and are
+    dropped if a sync of their time range does not.
+
+    Every call is also counted in the rollup of the local day it started
+    on, so window statistics are a sum over whole days and never a scan
+    of the calls themselves. The same pass counts it in the day rollups
+    of every line, user and queue it belongs to.
+    """
+
+    def __init__(self, time_zone: tzinfo = timezone.utc) -> None:
+        """Initialize an empty ledger."""
+        self.time_zone = time_zone
+        self._columns = CallColumns()
+        # Calls merged out of start order wait here until the next read
+        self._pending: Dict[int, Tuple[float, int, int, int]] = {}
+        # Start times, by ID hash, of the calls that may come back with
+        # another one: those the next sync fetches again and pushed calls
+        self._recent: Dict[int, float] = {}
+        self._provisional: Set[int] = set()
+        self._dirty: Dict[str, CallRecord] = {}
+        self._rollups: Dict[int, DayRollup] = {}
+        self._group_rollups: Dict[Tuple[str, str], Dict[int, DayRollup]] = {}
+        # Distinct group combinations, interned; code 0 is no groups at all
+        self._group_codes: Dict[Tuple[Tuple[str, str], ...], int] = {(): 0}
+        self._group_sets: List[Tuple[Tuple[str, str], ...]] = [()]
+        # Bounds of the local day last looked up, as (ordinal, start, end)
+        self._day_bounds: Tuple[int, float, float] = (0, 0.0, 0.0)
+        self._high_water_mark: Optional[datetime] = None
+        # Bumped whenever the counts change
+        self.revision = 0
+
+    def __len__(self) -> int:
+        """Return the number of calls held."""
+        return len(self._columns) + len(self._pending)
+
+    @property
+    def high_water_mark(self) -> Optional[datetime]:
+        """Return the time the calls endpoint has been synced until."""
+        return self._high_water_mark
+
+    @high_water_mark.setter
+    def high_water_mark(self, value: Optional[datetime]) -> None:
+        """Move the high-water mark and index the calls the next sync re-fetches."""
+        self._high_water_mark = value
+        recent = {key: self._recent[key] for key in self._provisional}
+        if value is not None:
+            since = to_timestamp(value) - SYNC_OVERLAP - _MOVE_SLACK
+            columns = self._columns
+            for row in range(bisect_left(columns.start, since), len(columns)):
+                recent[columns.key[row]] = columns.start[row]
+            for key, (start, *_) in self._pending.items():
+                if start >= since:
+                    recent[key] = start
+        self._recent = recent
+
+    def merge(
+        self, calls: Iterable[Dict[str, Any]], provisional: bool = False
+    ) -> int:
+        """Merge a batch of raw calls and return how many were new.
+
+        Provisional calls, pushed by the call event channel, are not saved
+        until a sync returns them.
+        """
+        new_calls = 0
+        for call in calls:
+            record = CallRecord.from_call(call)
+            if record is None:
+                _LOGGER.debug("Skipping call without start time: %s", call.get("id"))
+                continue
+            if self._merge_record(record, provisional):
+                new_calls += 1
+        return new_calls
+
+    def _merge_record(self, record: CallRecord, provisional: bool = False) -> bool:
+        """Merge one record and return True if the call was not held yet."""
+        columns = self._columns
+        start = to_timestamp(record.start)
+        key = hash(record.call_id)
+        direction = DIRECTION_CODES[record.direction]
+        groups = self._group_code(record.groups)
+
+        held_start = self._recent.get(key)
+        if held_start is not None and held_start != start:
+            # The call was re-fetched with another start time; it is added
+            # again below as if it had not been held
+            self._drop(key, held_start)
+        if held_start is not None or provisional:
+            self._recent[key] = start
+
+        if (
+            provisional
+            and held_start is None
+            and key not in self._pending
+            and columns.find(start, key) < 0
+        ):
+            self._provisional.add(key)
+        elif not provisional and key in self._provisional:
+            # The calls endpoint confirmed a pushed call, which is not saved yet
+            self._provisional.discard(key)
+            self._dirty[record.call_id] = record
+        unsaved = key in self._provisional
+
+        row = columns.find(start, key)
+        if row >= 0:
+            if (
+                columns.duration[row] == record.duration
+                and columns.direction[row] == direction
+                and columns.groups[row] == groups
+            ):
+                return False
+            self._count(
+                start,
+                columns.duration[row],
+                columns.direction[row],
+                columns.groups[row],
+                remove=True,
+            )
+            self._count(start, record.duration, direction, groups)
+            columns.duration[row] = record.duration
+            columns.direction[row] = direction
+            columns.groups[row] = groups
+            if not unsaved:
+                self._dirty[record.call_id] = record
+            return False
+
+        values = (start, record.duration, direction, groups)
+        previous = self._pending.get(key)
+        if previous == values:
+            return False
+        if previous is not None:
+            self._count(*previous, remove=True)
+        self._count(*values)
+        if previous is None and (not columns.start or start >= columns.start[-1]):
+            # Calls usually arrive in start order and are simply appended
+            columns.append(start, key, record.duration, direction, groups)
+        else:
+            self._pending[key] = values
+        if not unsaved:
+            self._dirty[record.call_id] = record
+        return previous is None and held_start is None
+
+    def _drop(self, key: int, start: float) -> None:
+        """Remove a held call and its counts."""
+        values = self._pending.pop(key, None)
+        if values is not None:
+            self._count(*values, remove=True)
+            return
+        columns = self._columns
+        row = columns.find(start, key)
+        if row >= 0:
+            self._count(
+                start,
+                columns.duration[row],
+                columns.direction[row],
+                columns.groups[row],
+                remove=True,
+            )
+            columns.delete(row)
+
+    def earliest_provisional(self) -> Optional[datetime]:
+        """Return the start of the earliest pushed call not synced yet."""
+        if not self._provisional:
+            return None
+        return from_timestamp(min(self._recent[key] for key in self._provisional))
+
+    def reconcile(self, since: datetime, until: datetime) -> int:
+        """Drop the pushed calls of a synced time range it did not return.
+
+        Returns how many were dropped.
+        """
+        since_ts, until_ts = to_timestamp(since), to_timestamp(until)
+        dropped = [
+            key
+            for key in self._provisional
+            if since_ts <= self._recent[key] < until_ts
+        ]
+        for key in dropped:
+            self._drop(key, self._recent.pop(key))
+            self._provisional.discard(key)
+        return len(dropped)
+
+    def _group_code(self, groups: Tuple[Tuple[str, str], ...]) -> int:
+        """Return the code of a combination of groups, interning it if new."""
+        code = self._group_codes.get(groups)
+        if code is None:
+            code = self._group_codes[groups] = len(self._group_sets)
+            self._group_sets.append(groups)
+        return code
+
+    def _count(
+        self,
+        start: float,
+        duration: int,
+        direction: int,
+        groups: int,
+        remove: bool = False,
+    ) -> None:
+        """Add a call to, or remove it from, the rollups of its day."""
+        self.revision += 1
+        day = self._day(start)
+        targets = [self._rollups]
+        for group in self._group_sets[groups]:
+            if group not in self._group_rollups:
+                self._group_rollups[group] = {}
+            targets.append(self._group_rollups[group])
+
+        for rollups in targets:
+            rollup = rollups.get(day)
+            if rollup is None:
+                rollup = rollups[day] = DayRollup()
+            if remove:
+                rollup.remove(duration, direction)
+            else:
+                rollup.add(duration, direction)
+
+    def _day(self, start: float) -> int:
+        """Return the ordinal of the local day a timestamp falls on."""
+        ordinal, day_start, day_end = self._day_bounds
+        if not day_start <= start < day_end:
+            day = datetime.fromtimestamp(start, self.time_zone).date()
+            ordinal = day.toordinal()
+            day_start = to_timestamp(local_midnight(day, self.time_zone))
+            day_end = to_timestamp(
+                local_midnight(day + timedelta(days=1), self.time_zone)
+            )
+            # Calls mostly arrive in start order, so this is rarely redone
+            self._day_bounds = (ordinal, day_start, day_end)
+        return ordinal
+
+    def _flush_pending(self) -> None:
+        """Merge the out-of-order calls into the sorted columns."""
+        if not self._pending:
+            return
+
+        old = self._columns
+        pending = sorted(
+            (start, key, duration, direction, groups)
+            for key, (start, duration, direction, groups) in self._pending.items()
+        )
+        self._pending.clear()
+
+        columns = CallColumns()
+        for row in heapq.merge(
+            zip(old.start, old.key, old.duration, old.direction, old.groups), pending
+        ):
+            columns.append(*row)
+        self._columns = columns
+
+    def load(
+        self, records: Iterable[CallRecord], high_water_mark: Optional[datetime]
+    ) -> None:
+        """Restore previously persisted calls and high-water mark."""
+        for record in records:
+            self._merge_record(record)
+        # Loaded calls are already persisted
+        self._dirty.clear()
+        self.high_water_mark = high_water_mark
+
+    def take_dirty(self) -> List[CallRecord]:
+        """Return and clear the calls added or changed since the last call."""
+        dirty = list(self._dirty.values())
+        self._dirty.clear()
+        return dirty
+
+    def prune(self, before: date) -> None:
+        """Drop every call that started before the given local day."""
+        self._flush_pending()
+        for key in self._columns.drop_before(
+            to_timestamp(local_midnight(before, self.time_zone))
+        ):
+            self._recent.pop(key, None)
+            self._provisional.discard(key)
+
+        first_day = before.toordinal()
+        for rollups in [self._rollups, *self._group_rollups.values()]:
+            for day in [day for day in rollups if day < first_day]:
+                del rollups[day]
+        # Forget groups that no longer have any calls held
+        for group in [
+            group for group, rollups in self._group_rollups.items() if not rollups
+        ]:
+            del self._group_rollups[group]
+
+    def window_stats(self, windows: Dict[str, date]) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics for every window, given its first local day."""
+        return _rollup_windows(self._rollups, windows)
+
+    def group_stats(
+        self, windows: Dict[str, date]
+    ) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+        """Return the window statistics of every group, by dimension."""
+        result: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {
+            dimension: {} for dimension in GROUP_FIELDS
+        }
+        for (dimension, value), rollups in self._group_rollups.items():
+            result[dimension][value] = _rollup_windows(rollups, windows)
+        return result
+
+
+def _rollup_windows(
+    rollups: Dict[int, DayRollup], windows: Dict[str, date]
+) -> Dict[str, Dict[str, Any]]:
+    """Sum day rollups into the statistics of every window.
+
+    Windows all end today, so walking the days newest first lets every
+    day be added once and each window be read off as its start is passed.
+    """
+    days = sorted(rollups, reverse=True)
+    total = DayRollup()
+    result = {}
+    row = 0
+    for first, name in sorted(
+        ((first_day.toordinal(), name) for name, first_day in windows.items()),
+        reverse=True,
+    ):
+        while row < len(days) and days[row] >= first:
+            total.merge(rollups[days[row]])
+            row += 1
+        result[name] = total.as_stats()
+    return {name: result[name] for name in windows}
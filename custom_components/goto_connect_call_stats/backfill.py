@@ -0,0 +1,249 @@
+"""Historical call backfill for GoTo Connect Call Stats integration.
+
+The regular sync only fetches the calls of the current statistics
+periods. A backfill fetches the local days before them, a few at a time
+through the same request slots and rate limit as the polls, and streams
+their calls into the local call store. Every finished day is recorded in
+the store alongside its calls, so an interrupted backfill resumes where
+it stopped. Once every day is in, the hourly long-term statistics of the
+range are imported again from the store.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .aggregator import CallRecord, local_midnight
+from .const import BACKFILL_CONCURRENCY, STORE_RETENTION_DAYS
+from .statistics import GoToStatisticsImporter
+from .store import GoToCallStore
+
+if TYPE_CHECKING:
+    from .coordinator import GoToConnectCallStatsCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sync state key of the backfill checkpoint
+_CHECKPOINT = "backfill"
+
+
+class GoToCallBackfill:
+    """Fetch the calls of past days into the local call store."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: "GoToConnectCallStatsCoordinator",
+        store: GoToCallStore,
+        statistics: GoToStatisticsImporter,
+    ) -> None:
+        """Initialize an idle backfill."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.store = store
+        self.statistics = statistics
+        self._task: Optional[asyncio.Task] = None
+        self._start: Optional[date] = None
+        self._end: Optional[date] = None
+        self._done: Set[date] = set()
+        self._calls = 0
+        self._last_error: Optional[str] = None
+        # Days finish out of order; their checkpoints are written in turn
+        self._checkpoint_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Return whether a backfill is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the progress of the last backfill for diagnostics."""
+        total = (self._end - self._start).days + 1 if self._start and self._end else 0
+        return {
+            "start_date": self._start.isoformat() if self._start else None,
+            "end_date": self._end.isoformat() if self._end else None,
+            "days_done": len(self._done),
+            "days_total": total,
+            "running": self.running,
+            "calls_fetched": self._calls,
+            "last_error": self._last_error,
+        }
+
+    async def _async_load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Return the stored checkpoint, if any."""
+        try:
+            value = await self.store.async_get_state(_CHECKPOINT)
+        except sqlite3.Error as e:
+            _LOGGER.warning("Failed to read backfill checkpoint: %s", e)
+            return None
+        return json.loads(value) if value else None
+
+    def _checkpoint(self, finished: bool = False) -> Dict[str, str]:
+        """Return the checkpoint of the backfill as sync state."""
+        return {
+            _CHECKPOINT: json.dumps(
+                {
+                    "start": self._start.isoformat(),
+                    "end": self._end.isoformat(),
+                    "done": sorted(day.isoformat() for day in self._done),
+                    "finished": finished,
+                }
+            )
+        }
+
+    async def async_start(self, start: date, end: date) -> None:
+        """Start backfilling the local days from start to end, both included.
+
+        Days the call store would not keep or the regular sync already
+        covers are left out. A checkpoint of the same range is resumed.
+        """
+        if self.running:
+            raise HomeAssistantError("A call backfill is already running")
+
+        oldest = dt_util.now().date() - timedelta(days=STORE_RETENTION_DAYS - 1)
+        newest = self.coordinator.first_synced_day() - timedelta(days=1)
+        if start < oldest:
+            _LOGGER.warning(
+                "Backfill starts before the %d days the call store keeps, "
+                "starting on %s instead",
+                STORE_RETENTION_DAYS,
+                oldest,
+            )
+            start = oldest
+        if end > newest:
+            _LOGGER.debug("Regular sync covers the days after %s", newest)
+            end = newest
+        if start > end:
+            raise HomeAssistantError(
+                f"No days to backfill between {start} and {end}; the regular "
+                f"sync already covers the days since {newest + timedelta(days=1)}"
+            )
+
+        done: Set[date] = set()
+        checkpoint = await self._async_load_checkpoint()
+        if (
+            checkpoint
+            and checkpoint["start"] == start.isoformat()
+            and checkpoint["end"] == end.isoformat()
+            and not checkpoint["finished"]
+        ):
+            done = {date.fromisoformat(day) for day in checkpoint["done"]}
+        self._async_run(start, end, done)
+
+    async def async_resume(self) -> None:
+        """Resume an unfinished backfill after a restart."""
+        checkpoint = await self._async_load_checkpoint()
+        if not checkpoint or checkpoint["finished"] or self.running:
+            return
+        _LOGGER.info(
+            "Resuming call backfill from %s to %s", checkpoint["start"], checkpoint["end"]
+        )
+        self._async_run(
+            date.fromisoformat(checkpoint["start"]),
+            date.fromisoformat(checkpoint["end"]),
+            {date.fromisoformat(day) for day in checkpoint["done"]},
+        )
+
+    def _async_run(self, start: date, end: date, done: Set[date]) -> None:
+        """Run the backfill in the background."""
+        self._start, self._end, self._done = start, end, done
+        self._calls = 0
+        self._last_error = None
+        self._task = self.hass.async_create_background_task(
+            self._async_backfill(),
+            f"{self.coordinator.entry.entry_id} call backfill",
+        )
+
+    async def async_stop(self) -> None:
+        """Cancel a running backfill; its checkpoint is kept."""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _async_backfill(self) -> None:
+        """Fetch every day not done yet, then rebuild the statistics."""
+        start, end = self._start, self._end
+        days: List[date] = [
+            day
+            for offset in range((end - start).days + 1)
+            if (day := start + timedelta(days=offset)) not in self._done
+        ]
+        _LOGGER.info(
+            "Backfilling calls from %s to %s, %d of %d days left",
+            start,
+            end,
+            len(days),
+            (end - start).days + 1,
+        )
+
+        slots = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+
+        async def _async_day(day: date) -> None:
+            async with slots:
+                await self._async_backfill_day(day)
+
+        try:
+            # Newest days first, so a cut-short backfill keeps the most recent
+            results = await asyncio.gather(
+                *(_async_day(day) for day in reversed(days)), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+            time_zone = dt_util.DEFAULT_TIME_ZONE
+            try:
+                await self.statistics.async_rebuild(
+                    local_midnight(start, time_zone),
+                    local_midnight(end + timedelta(days=1), time_zone),
+                )
+            except Exception as e:
+                # The calls are stored either way; only the statistics lag
+                _LOGGER.warning("Failed to import backfilled call statistics: %s", e)
+            async with self._checkpoint_lock:
+                await self.store.async_save([], None, self._checkpoint(finished=True))
+        except asyncio.CancelledError:
+            _LOGGER.debug("Call backfill stopped with %d days done", len(self._done))
+            raise
+        except (HomeAssistantError, ValueError, sqlite3.Error) as e:
+            # The checkpoint keeps the finished days for the next attempt
+            self._last_error = str(e)
+            _LOGGER.warning(
+                "Call backfill stopped after %d days: %s", len(self._done), e
+            )
+        else:
+            _LOGGER.info(
+                "Backfilled %d calls from %s to %s", self._calls, start, end
+            )
+
+    async def _async_backfill_day(self, day: date) -> None:
+        """Stream the calls of one local day into the store and checkpoint it.
+
+        Each batch is saved when the next one arrives, so the last is saved
+        in the same transaction as the day's checkpoint.
+        """
+        time_zone = dt_util.DEFAULT_TIME_ZONE
+        held: List[CallRecord] = []
+        async for calls in self.coordinator.async_fetch_calls(
+            local_midnight(day, time_zone),
+            local_midnight(day + timedelta(days=1), time_zone),
+        ):
+            if held:
+                await self.store.async_save(held, None)
+            held = [record for call in calls if (record := CallRecord.from_call(call))]
+            self._calls += len(held)
+
+        async with self._checkpoint_lock:
+            self._done.add(day)
+            await self.store.async_save(held, None, self._checkpoint())
@@ -8,11 +8,34 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-
-from .const import DOMAIN, OAUTH2_SCOPE
+from homeassistant.helpers import selector
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_BUSINESS_DAYS,
+    CONF_BUSINESS_HOURS_END,
+    CONF_BUSINESS_HOURS_START,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METRICS_ENDPOINT,
+    CONF_PERIOD_ALIGNMENT,
+    CONF_REALTIME,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_BUSINESS_DAYS,
+    DEFAULT_BUSINESS_HOURS_END,
+    DEFAULT_BUSINESS_HOURS_START,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_METRICS_ENDPOINT,
+    DEFAULT_PERIOD_ALIGNMENT,
+    DEFAULT_REALTIME,
+    DOMAIN,
+    OAUTH2_SCOPE,
+    PERIOD_ALIGNMENT_CALENDAR,
+    PERIOD_ALIGNMENT_ROLLING,
+)
 from .oauth import GoToOAuth2Manager
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,6 +52,14 @@ class GoToConnectCallStatsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.client_secret: Optional[str] = None
         self.oauth_manager: Optional[GoToOAuth2Manager] = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: ConfigEntry,
+    ) -> "GoToConnectCallStatsOptionsFlow":
+        """Get the options flow for this handler."""
+        return GoToConnectCallStatsOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: Optional[Dict[str, Any]] = None
     ) -> FlowResult:
@@ -155,6 +186,88 @@ Copy the entire URL and paste it below.
         )
 
 
+class GoToConnectCallStatsOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for GoTo Connect Call Stats."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Required(
+                        CONF_REALTIME,
+                        default=options.get(CONF_REALTIME, DEFAULT_REALTIME),
+                    ): bool,
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_BUSINESS_DAYS,
+                        default=options.get(CONF_BUSINESS_DAYS, DEFAULT_BUSINESS_DAYS),
+                    ): cv.multi_select(
+                        {
+                            "mon": "Monday",
+                            "tue": "Tuesday",
+                            "wed": "Wednesday",
+                            "thu": "Thursday",
+                            "fri": "Friday",
+                            "sat": "Saturday",
+                            "sun": "Sunday",
+                        }
+                    ),
+                    vol.Required(
+                        CONF_BUSINESS_HOURS_START,
+                        default=options.get(
+                            CONF_BUSINESS_HOURS_START, DEFAULT_BUSINESS_HOURS_START
+                        ),
+                    ): selector.TimeSelector(),
+                    vol.Required(
+                        CONF_BUSINESS_HOURS_END,
+                        default=options.get(
+                            CONF_BUSINESS_HOURS_END, DEFAULT_BUSINESS_HOURS_END
+                        ),
+                    ): selector.TimeSelector(),
+                    vol.Required(
+                        CONF_PERIOD_ALIGNMENT,
+                        default=options.get(
+                            CONF_PERIOD_ALIGNMENT, DEFAULT_PERIOD_ALIGNMENT
+                        ),
+                    ): vol.In(
+                        {
+                            PERIOD_ALIGNMENT_ROLLING: "Rolling (last 7 and 30 days)",
+                            PERIOD_ALIGNMENT_CALENDAR: "Calendar week and month",
+                        }
+                    ),
+                    vol.Required(
+                        CONF_METRICS_ENDPOINT,
+                        default=options.get(
+                            CONF_METRICS_ENDPOINT, DEFAULT_METRICS_ENDPOINT
+                        ),
+                    ): bool,
+                }
+            ),
+        )
 
 
 class InvalidCredentials(HomeAssistantError):
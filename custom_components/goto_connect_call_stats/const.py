@@ -13,6 +13,41 @@ GOTO_API_BASE_URL = "https://api.goto.com"
 CALLS_API_URL = "/rest/calls/v1/calls"
 USERS_API_URL = "/rest/users/v1/users/me"
 ACCOUNTS_API_URL = "/rest/accounts/v1/accounts"
+NOTIFICATION_CHANNEL_API_URL = "/notification-channel/v1/channels"
+CALL_EVENTS_SUBSCRIPTIONS_API_URL = "/call-events/v1/subscriptions"
+
+# HTTP connection pool (sockets, seconds)
+HTTP_POOL_LIMIT = 20
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_KEEPALIVE_TIMEOUT = 120
+HTTP_DNS_CACHE_TTL = 600
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_REQUEST_TIMEOUT = 60
+
+# Requests in flight at once across every config entry
+HTTP_MAX_IN_FLIGHT = 8
+
+# Per-host request rate (requests/second, burst) and retry backoff (seconds)
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_MAX_RETRIES = 4
+RATE_LIMIT_BACKOFF_BASE = 1
+RATE_LIMIT_BACKOFF_MAX = 60
+
+# User and account metadata is re-validated after this many seconds
+USER_INFO_TTL = 4 * 3600
+
+# Calls endpoint pagination
+CALLS_PAGE_SIZE = 1000
+CALLS_PAGE_MARKER_PARAM = "pageMarker"
+CALLS_NEXT_PAGE_MARKER = "nextPageMarker"
+
+# Calls are decoded off the response stream and merged in batches this size
+CALLS_DECODE_BATCH = 200
+
+# Longer sync ranges are split into chunks of this many seconds that are
+# fetched in parallel
+CALLS_FETCH_CHUNK = 86400
 
 # Configuration keys
 CONF_CLIENT_ID = "client_id"
@@ -21,6 +56,32 @@ CONF_ACCESS_TOKEN = "access_token"
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_TOKEN_EXPIRES_AT = "token_expires_at"
 
+# Options
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+CONF_REALTIME = "realtime"
+DEFAULT_REALTIME = False
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = True
+CONF_BUSINESS_DAYS = "business_days"
+DEFAULT_BUSINESS_DAYS = ["mon", "tue", "wed", "thu", "fri"]
+CONF_BUSINESS_HOURS_START = "business_hours_start"
+DEFAULT_BUSINESS_HOURS_START = "08:00:00"
+CONF_BUSINESS_HOURS_END = "business_hours_end"
+DEFAULT_BUSINESS_HOURS_END = "18:00:00"
+CONF_PERIOD_ALIGNMENT = "period_alignment"
+PERIOD_ALIGNMENT_ROLLING = "rolling"
+PERIOD_ALIGNMENT_CALENDAR = "calendar"
+DEFAULT_PERIOD_ALIGNMENT = PERIOD_ALIGNMENT_ROLLING
+CONF_METRICS_ENDPOINT = "metrics_endpoint"
+DEFAULT_METRICS_ENDPOINT = False
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# Refresh the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_REQUEST_TIMEOUT = 30
+
 # Sensor names
 SENSOR_TOTAL_CALLS = "total_calls"
 SENSOR_INCOMING_CALLS = "incoming_calls"
@@ -31,9 +92,82 @@ SENSOR_AVERAGE_CALL_DURATION = "average_call_duration"
 SENSOR_TODAY_CALLS = "today_calls"
 SENSOR_WEEK_CALLS = "week_calls"
 SENSOR_MONTH_CALLS = "month_calls"
+SENSOR_DURATION_PERCENTILE = "duration_p{percentile}"
+SENSOR_DURATION_DISTRIBUTION = "duration_distribution"
+SENSOR_GROUP_CALLS = "calls"
+SENSOR_POLL_DURATION = "poll_duration"
+SENSOR_API_REQUESTS = "api_requests"
+SENSOR_BYTES_RECEIVED = "bytes_received"
+SENSOR_CALLS_PROCESSED = "calls_processed"
+SENSOR_USER_INFO_CACHE_HIT_RATE = "user_info_cache_hit_rate"
+
+# Statistics periods, narrowest first
+PERIOD_TODAY = "today"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIODS = [PERIOD_TODAY, PERIOD_WEEK, PERIOD_MONTH]
+
+# Call breakdown dimensions
+GROUP_LINE = "line"
+GROUP_USER = "user"
+GROUP_QUEUE = "queue"
+
+# Length in local days (today included) of the rolling week and month
+ROLLING_WEEK_DAYS = 7
+ROLLING_MONTH_DAYS = 30
 
 # Update interval (5 minutes)
 UPDATE_INTERVAL = 300
 
+# Adaptive polling bounds (seconds) and idle backoff factor
+ADAPTIVE_MIN_INTERVAL = 60
+ADAPTIVE_MAX_INTERVAL = 3600
+ADAPTIVE_BACKOFF_FACTOR = 2
+
+# Interval of quiet polls during business hours (2 minutes), between the
+# minimum and the update interval
+ADAPTIVE_BUSINESS_INTERVAL = 120
+
+# Poll interval when call events are pushed in realtime; the poll then only
+# reconciles anything the event channel missed
+RECONCILE_INTERVAL = 1800
+
+# Notification channel name and how long before its expiry it is renewed
+NOTIFICATION_CHANNEL_NICKNAME = "ha-goto-connect-call-stats"
+NOTIFICATION_CHANNEL_RENEW_MARGIN = 3600
+
+# Call events arriving within this many seconds are merged in one batch
+REALTIME_FLUSH_DELAY = 2
+
+# Incremental sync re-fetches this many seconds before the high-water mark
+# to pick up calls that were finalised after the previous poll
+SYNC_OVERLAP = 900
+
+# Local call store retention (days) and how often it is compacted (seconds);
+# long enough to hold a backfilled year
+STORE_RETENTION_DAYS = 400
+STORE_COMPACT_INTERVAL = 86400
+
+# Relative accuracy of the call duration quantile sketches
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Call duration percentiles reported per window
+DURATION_PERCENTILES = [50, 90, 99]
+
+# Upper bounds (seconds) of the call duration histogram buckets
+DURATION_HISTOGRAM_BOUNDS = [30, 60, 120, 300, 600, 1800]
+
+# Historical backfill: local days fetched at once, each one checkpointed
+BACKFILL_CONCURRENCY = 2
+
+# Services
+SERVICE_BACKFILL = "backfill"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Polls whose stage timings are kept for the rolling percentiles
+METRICS_SAMPLES = 100
+
 # Platforms
 PLATFORMS = ["sensor"] 
\ No newline at end of file
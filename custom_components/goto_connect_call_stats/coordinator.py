@@ -1,21 +1,74 @@
 """Coordinator for GoTo Connect Call Stats integration."""
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import aiohttp
+import ijson
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .aggregator import CallLedger, format_timestamp, local_midnight, period_start_days
 from .const import (
     CALLS_API_URL,
+    CALLS_FETCH_CHUNK,
+    CALLS_PAGE_MARKER_PARAM,
+    CALLS_PAGE_SIZE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_BUSINESS_DAYS,
+    CONF_BUSINESS_HOURS_END,
+    CONF_BUSINESS_HOURS_START,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_PERIOD_ALIGNMENT,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_BUSINESS_DAYS,
+    DEFAULT_BUSINESS_HOURS_END,
+    DEFAULT_BUSINESS_HOURS_START,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_PERIOD_ALIGNMENT,
     GOTO_API_BASE_URL,
+    PERIOD_MONTH,
+    PERIOD_TODAY,
+    PERIOD_WEEK,
+    RECONCILE_INTERVAL,
+    STORE_COMPACT_INTERVAL,
+    SYNC_OVERLAP,
     UPDATE_INTERVAL,
+    USER_INFO_TTL,
     USERS_API_URL,
 )
-from .oauth import GoToOAuth2Manager
+from .backfill import GoToCallBackfill
+from .decoder import CallPageDecoder
+from .instrumentation import (
+    COUNTER_API_ERRORS,
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_CALLS_PROCESSED,
+    COUNTER_PAGES,
+    COUNTER_POLL_FAILURES,
+    COUNTER_TOKEN_REFRESHES,
+    COUNTER_USER_INFO_CACHED,
+    COUNTER_USER_INFO_FETCHED,
+    COUNTER_USER_INFO_NOT_MODIFIED,
+    STAGE_AGGREGATE,
+    STAGE_DECODE,
+    STAGE_NETWORK,
+    STAGE_STORE,
+    STAGE_TOKEN,
+    STAGE_USER_INFO,
+    PollMetrics,
+)
+from .oauth import get_oauth_manager
+from .polling import AdaptivePollInterval, parse_time
+from .ratelimit import GoToRequestScheduler, RateLimitedError, get_request_scheduler
+from .statistics import GoToStatisticsImporter
+from .store import GoToCallStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,178 +78,532 @@ class GoToConnectCallStatsCoordinator(DataUpdateCoordinator):
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
+        base_interval = timedelta(seconds=UPDATE_INTERVAL)
         super().__init__(
             hass,
             _LOGGER,
             name="GoTo Connect Call Stats",
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_interval=base_interval,
         )
         self.entry = entry
-        self.oauth_manager = GoToOAuth2Manager(hass, entry)
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.oauth_manager = get_oauth_manager(hass, entry)
+        # Entries share one scheduler, which owns the connection pool and
+        # spreads their polls across the interval
+        self._scheduler = get_request_scheduler(hass)
+        self._scheduler.register(entry.entry_id)
+        self._base_interval = base_interval
+        # Set by the call event listener while it is subscribed
+        self._realtime_active = False
+        self._user_info: Dict[str, Any] = {}
+        self._user_info_etag: Optional[str] = None
+        self._user_info_fetched_at: Optional[float] = None
+        # Caps the requests in flight at once across the whole poll
+        self._request_slots = asyncio.Semaphore(
+            entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            )
+        )
+        # Periods are made of whole days in the configured time zone
+        self._ledger = CallLedger(dt_util.DEFAULT_TIME_ZONE)
+        self._period_alignment = entry.options.get(
+            CONF_PERIOD_ALIGNMENT, DEFAULT_PERIOD_ALIGNMENT
+        )
+        self._last_sync_new_calls = 0
+        self._poll_interval: Optional[AdaptivePollInterval] = None
+        if entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+            self._poll_interval = AdaptivePollInterval(
+                entry.options.get(CONF_BUSINESS_DAYS, DEFAULT_BUSINESS_DAYS),
+                parse_time(
+                    entry.options.get(
+                        CONF_BUSINESS_HOURS_START, DEFAULT_BUSINESS_HOURS_START
+                    )
+                ),
+                parse_time(
+                    entry.options.get(CONF_BUSINESS_HOURS_END, DEFAULT_BUSINESS_HOURS_END)
+                ),
+            )
+        self._store = GoToCallStore(hass, entry.entry_id)
+        self._store_loaded = False
+        self._statistics = GoToStatisticsImporter(hass, entry, self._store)
+        self._last_compacted: Optional[datetime] = None
+        self.metrics = PollMetrics()
+        self.backfill = GoToCallBackfill(hass, self, self._store, self._statistics)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session shared by every config entry."""
+        return self._scheduler.session
+
+    @property
+    def polling_diagnostics(self) -> Dict[str, Any]:
+        """Return the current poll interval and why it was chosen."""
+        if self._realtime_active:
+            return {
+                "adaptive": False,
+                "realtime": True,
+                "interval": float(RECONCILE_INTERVAL),
+            }
+        if self._poll_interval is None:
+            return {
+                "adaptive": False,
+                "realtime": False,
+                "interval": self._base_interval.total_seconds(),
+            }
+        return {"adaptive": True, "realtime": False, **self._poll_interval.as_dict()}
+
+    @callback
+    def async_set_realtime_active(self, active: bool) -> None:
+        """Switch between reconciling and regular polling.
+
+        Called by the call event listener when it subscribes or loses its
+        channel, so the entry falls back to regular polls without it.
+        """
+        if active == self._realtime_active:
+            return
+        self._realtime_active = active
+        _LOGGER.debug("Realtime call events %s", "active" if active else "inactive")
+        if not active:
+            # Do not wait out the long reconcile interval
+            self.update_interval = self._scheduler.stagger(
+                self.entry.entry_id, self._base_interval
+            )
+            self._schedule_refresh()
+
+    def _next_interval(self) -> timedelta:
+        """Return the time until the next poll, before staggering."""
+        # With call events pushed in realtime the poll only reconciles
+        if self._realtime_active:
+            return timedelta(seconds=RECONCILE_INTERVAL)
+        if self._poll_interval is None:
+            return self._base_interval
+        interval, reason = self._poll_interval.update(
+            dt_util.now(), self._last_sync_new_calls
+        )
+        _LOGGER.debug("Next poll in %s (%s)", interval, reason)
+        return interval
+
+    @property
+    def sync_diagnostics(self) -> Dict[str, Any]:
+        """Return the state of the incremental call sync."""
+        high_water_mark = self._ledger.high_water_mark
+        return {
+            "calls_held": len(self._ledger),
+            "high_water_mark": high_water_mark.isoformat() if high_water_mark else None,
+            "last_sync_new_calls": self._last_sync_new_calls,
+        }
+
+    @property
+    def request_scheduler(self) -> GoToRequestScheduler:
+        """Return the request scheduler used for API requests."""
+        return self._scheduler
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Update data from GoTo Connect API."""
+        self.metrics.start_poll()
         try:
-            # Load tokens
-            if not self.oauth_manager.load_tokens():
-                raise UpdateFailed("Failed to load authentication tokens")
-
-            # Get headers for API requests
-            headers = self.oauth_manager.get_headers()
+            with self.metrics.time(STAGE_TOKEN):
+                # Load tokens
+                if not self.oauth_manager.load_tokens():
+                    raise UpdateFailed("Failed to load authentication tokens")
 
-            # Create session if needed
-            if self._session is None or self._session.closed:
-                self._session = aiohttp.ClientSession()
+                # Get headers for API requests, refreshing the token on the
+                # shared session before it expires
+                refresh_count = self.oauth_manager.refresh_count
+                headers = await self.oauth_manager.async_get_headers(self.session)
+                self.metrics.count(
+                    COUNTER_TOKEN_REFRESHES,
+                    self.oauth_manager.refresh_count - refresh_count,
+                )
 
             # Fetch call data
             call_stats = await self._fetch_call_stats(headers)
+
+            # Keep this entry's polls out of step with the other entries
+            self.update_interval = self._scheduler.stagger(
+                self.entry.entry_id, self._next_interval()
+            )
             
             return call_stats
 
         except Exception as err:
+            self.metrics.count(COUNTER_POLL_FAILURES)
             _LOGGER.error("Error updating GoTo Connect Call Stats: %s", err)
             raise UpdateFailed(f"Error updating call stats: {err}") from err
+        finally:
+            self.metrics.finish_poll()
 
     async def _fetch_call_stats(self, headers: Dict[str, str]) -> Dict[str, Any]:
         """Fetch call statistics from GoTo Connect API."""
         try:
-            # Get user information first
-            user_info = await self._fetch_user_info(headers)
-            
-            # Get call data for different time periods
-            today_stats = await self._fetch_calls_for_period(headers, "today")
-            week_stats = await self._fetch_calls_for_period(headers, "week")
-            month_stats = await self._fetch_calls_for_period(headers, "month")
-            
-            # Calculate aggregated statistics
-            total_calls = today_stats.get("total", 0)
-            incoming_calls = today_stats.get("incoming", 0)
-            outgoing_calls = today_stats.get("outgoing", 0)
-            missed_calls = today_stats.get("missed", 0)
-            
-            # Calculate call duration statistics
-            call_durations = today_stats.get("durations", [])
-            total_duration = sum(call_durations) if call_durations else 0
-            avg_duration = total_duration / len(call_durations) if call_durations else 0
-            
-            return {
-                "user_info": user_info,
-                "today": today_stats,
-                "week": week_stats,
-                "month": month_stats,
-                "total_calls": total_calls,
-                "incoming_calls": incoming_calls,
-                "outgoing_calls": outgoing_calls,
-                "missed_calls": missed_calls,
-                "total_duration": total_duration,
-                "average_duration": avg_duration,
-                "last_updated": datetime.now().isoformat(),
-            }
-            
+            # Fetch user information and call data concurrently; the widest
+            # window is fetched once and the narrower ones derived from it
+            user_info, (period_stats, group_stats) = await asyncio.gather(
+                self._fetch_user_info(headers),
+                self._fetch_period_stats(headers),
+            )
+            return self._build_data(user_info, period_stats, group_stats)
+
         except Exception as e:
             _LOGGER.error("Failed to fetch call statistics: %s", e)
             raise
 
+    def _build_data(
+        self,
+        user_info: Dict[str, Any],
+        period_stats: Dict[str, Dict[str, Any]],
+        group_stats: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]],
+    ) -> Dict[str, Any]:
+        """Build the coordinator data from the period statistics."""
+        today_stats = period_stats[PERIOD_TODAY]
+        week_stats = period_stats[PERIOD_WEEK]
+        month_stats = period_stats[PERIOD_MONTH]
+
+        # Calculate aggregated statistics
+        total_calls = today_stats.get("total", 0)
+        incoming_calls = today_stats.get("incoming", 0)
+        outgoing_calls = today_stats.get("outgoing", 0)
+        missed_calls = today_stats.get("missed", 0)
+
+        # Calculate call duration statistics
+        total_duration = today_stats.get("total_duration", 0)
+        avg_duration = today_stats.get("average_duration", 0)
+
+        return {
+            "user_info": user_info,
+            "today": today_stats,
+            "week": week_stats,
+            "month": month_stats,
+            "groups": group_stats,
+            "total_calls": total_calls,
+            "incoming_calls": incoming_calls,
+            "outgoing_calls": outgoing_calls,
+            "missed_calls": missed_calls,
+            "total_duration": total_duration,
+            "average_duration": avg_duration,
+            "last_updated": dt_util.now().isoformat(),
+        }
+
+    async def async_ingest_calls(self, calls: List[Dict[str, Any]]) -> None:
+        """Merge calls pushed by the call event channel and update listeners.
+
+        The regular poll keeps running on its own schedule as a
+        reconciliation pass, so it is not rescheduled here. The pushed
+        calls stay provisional until that pass returns them.
+        """
+        self.metrics.count(COUNTER_CALLS_PROCESSED, len(calls))
+        revision = self._ledger.revision
+        self._ledger.merge(calls, provisional=True)
+        if self._ledger.revision == revision:
+            return
+
+        now = dt_util.utcnow()
+        windows = self._get_period_windows(now)
+        self._ledger.prune(min(windows.values()))
+        await self._async_persist(now.replace(tzinfo=None))
+
+        self.data = self._build_data(
+            self._user_info,
+            self._ledger.window_stats(windows),
+            self._ledger.group_stats(windows),
+        )
+        self.async_update_listeners()
+
     async def _fetch_user_info(self, headers: Dict[str, str]) -> Dict[str, Any]:
-        """Fetch user information from GoTo Connect API."""
+        """Fetch user information from GoTo Connect API.
+
+        The response is cached for USER_INFO_TTL and then re-validated with
+        If-None-Match, so an unchanged user costs a 304 every few hours.
+        """
+        if (
+            self._user_info_fetched_at is not None
+            and time.monotonic() - self._user_info_fetched_at < USER_INFO_TTL
+        ):
+            self.metrics.count(COUNTER_USER_INFO_CACHED)
+            return self._user_info
+
+        with self.metrics.time(STAGE_USER_INFO):
+            await self._revalidate_user_info(headers)
+        return self._user_info
+
+    async def _revalidate_user_info(self, headers: Dict[str, str]) -> None:
+        """Fetch the user information unless it is unchanged."""
         try:
             url = f"{GOTO_API_BASE_URL}{USERS_API_URL}"
-            async with self._session.get(url, headers=headers) as response:
+            request_headers = dict(headers)
+            if self._user_info_etag:
+                request_headers["If-None-Match"] = self._user_info_etag
+
+            async with self._request_slots, self._scheduler.request(
+                self.session, "GET", url, self.metrics, headers=request_headers
+            ) as response:
                 if response.status == 200:
-                    return await response.json()
+                    self._user_info = await response.json()
+                    self._user_info_etag = response.headers.get("ETag")
+                    self._user_info_fetched_at = time.monotonic()
+                    self.metrics.count(COUNTER_USER_INFO_FETCHED)
+                elif response.status == 304:
+                    self._user_info_fetched_at = time.monotonic()
+                    self.metrics.count(COUNTER_USER_INFO_NOT_MODIFIED)
                 else:
+                    self.metrics.count(COUNTER_API_ERRORS)
                     _LOGGER.warning("Failed to fetch user info: %s", response.status)
-                    return {}
+                    if response.status in (401, 403, 404):
+                        self.invalidate_user_info()
         except Exception as e:
+            self.metrics.count(COUNTER_API_ERRORS)
             _LOGGER.error("Error fetching user info: %s", e)
-            return {}
 
-    async def _fetch_calls_for_period(
-        self, headers: Dict[str, str], period: str
-    ) -> Dict[str, Any]:
-        """Fetch call data for a specific time period."""
+    def invalidate_user_info(self) -> None:
+        """Drop the cached user information so the next poll refetches it."""
+        self._user_info = {}
+        self._user_info_etag = None
+        self._user_info_fetched_at = None
+
+    def first_synced_day(self) -> date:
+        """Return the first local day the regular sync keeps calls of."""
+        return min(self._get_period_windows(dt_util.utcnow()).values())
+
+    async def async_fetch_calls(
+        self, start_date: datetime, end_date: datetime
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the calls of a time range (naive UTC) without merging them.
+
+        Shares the request slots and the rate limit with the regular sync.
+        """
+        headers = await self.oauth_manager.async_get_headers(self.session)
+        async for calls in self._fetch_call_pages(headers, start_date, end_date):
+            yield calls
+
+    def _get_period_windows(self, now: datetime) -> Dict[str, date]:
+        """Return the first local day of every statistics period."""
+        today = now.astimezone(self._ledger.time_zone).date()
+        return period_start_days(today, self._period_alignment)
+
+    async def _fetch_period_stats(
+        self, headers: Dict[str, str]
+    ) -> Tuple[
+        Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+    ]:
+        """Sync new calls into the ledger and compute every period from it.
+
+        Returns the account-wide statistics and those of every line, user
+        and queue, all from the same synced calls.
+        """
+        now = dt_util.utcnow()
+        # Calls and the sync range are kept in naive UTC
+        end_date = now.replace(tzinfo=None)
+        windows = self._get_period_windows(now)
+        first_day = min(windows.values())
+        month_start = local_midnight(first_day, self._ledger.time_zone)
+
+        if not self._store_loaded:
+            with self.metrics.time(STAGE_STORE):
+                await self._async_load_store(month_start)
+
+        # Only fetch calls newer than the last successful sync, with a small
+        # overlap for calls finalised after that poll
+        high_water_mark = self._ledger.high_water_mark
+        if high_water_mark is None or high_water_mark < month_start:
+            start_date = month_start
+        else:
+            start_date = max(month_start, high_water_mark - timedelta(seconds=SYNC_OVERLAP))
+        # Calls are pushed when they end, so a long call may have started
+        # before the overlap; sync back to it so it is confirmed or dropped
+        earliest_pushed = self._ledger.earliest_provisional()
+        if earliest_pushed is not None:
+            start_date = max(month_start, min(start_date, earliest_pushed))
+
+        self._last_sync_new_calls = 0
+        try:
+            new_calls = await self._sync_calls(headers, start_date, end_date)
+        except CallFetchError as e:
+            self.metrics.count(COUNTER_API_ERRORS)
+            # Nothing has been fully synced yet, so any numbers would be
+            # partial; stay unavailable instead of publishing them
+            if self._ledger.high_water_mark is None:
+                raise UpdateFailed(f"Initial call sync failed: {e}") from e
+            # Otherwise keep the high-water mark so the next poll retries
+            # this range, and keep reporting the calls already held
+            _LOGGER.warning("%s, keeping previous call data", e)
+        else:
+            # Pushed calls the sync did not return may carry another ID or
+            # start time than the calls endpoint; its numbers win. The
+            # request range is in whole seconds.
+            dropped = self._ledger.reconcile(
+                start_date.replace(microsecond=0), end_date.replace(microsecond=0)
+            )
+            if dropped:
+                _LOGGER.debug("Dropped %d pushed calls the sync did not return", dropped)
+            self._ledger.high_water_mark = end_date
+            self._last_sync_new_calls = new_calls
+            _LOGGER.debug(
+                "Synced calls since %s, %d new, %d held",
+                start_date,
+                new_calls,
+                len(self._ledger),
+            )
+
+        with self.metrics.time(STAGE_AGGREGATE):
+            self._ledger.prune(first_day)
+        with self.metrics.time(STAGE_STORE):
+            await self._async_persist(end_date)
+            await self._async_import_statistics()
+        with self.metrics.time(STAGE_AGGREGATE):
+            period_stats = self._ledger.window_stats(windows)
+            group_stats = self._ledger.group_stats(windows)
+        return period_stats, group_stats
+
+    async def _async_load_store(self, since: datetime) -> None:
+        """Restore the ledger from the local call store."""
+        try:
+            records, high_water_mark = await self._store.async_load(since)
+        except sqlite3.Error as e:
+            _LOGGER.warning("Failed to load call store, doing a full sync: %s", e)
+        else:
+            self._ledger.load(records, high_water_mark)
+            _LOGGER.debug(
+                "Loaded %d calls from call store, synced until %s",
+                len(records),
+                high_water_mark,
+            )
+        self._store_loaded = True
+
+    async def _async_persist(self, now: datetime) -> None:
+        """Write changed calls to the local call store and compact it."""
         try:
-            # Calculate date range based on period
-            end_date = datetime.now()
-            if period == "today":
-                start_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif period == "week":
-                start_date = end_date - timedelta(days=7)
-            elif period == "month":
-                start_date = end_date - timedelta(days=30)
-            else:
-                start_date = end_date - timedelta(days=1)
-
-            # Format dates for API
-            start_str = start_date.isoformat() + "Z"
-            end_str = end_date.isoformat() + "Z"
-
-            # Build API URL with parameters
-            url = f"{GOTO_API_BASE_URL}{CALLS_API_URL}"
+            await self._store.async_save(
+                self._ledger.take_dirty(), self._ledger.high_water_mark
+            )
+            if self._last_compacted is None or (
+                now - self._last_compacted
+            ).total_seconds() >= STORE_COMPACT_INTERVAL:
+                await self._store.async_compact(now)
+                self._last_compacted = now
+        except sqlite3.Error as e:
+            _LOGGER.warning("Failed to update call store: %s", e)
+
+    async def _async_import_statistics(self) -> None:
+        """Import the hourly totals that the next sync can no longer change."""
+        high_water_mark = self._ledger.high_water_mark
+        if high_water_mark is None:
+            return
+
+        try:
+            await self._statistics.async_import(
+                high_water_mark - timedelta(seconds=SYNC_OVERLAP)
+            )
+        except Exception as e:
+            _LOGGER.warning("Failed to import call statistics: %s", e)
+
+    async def _sync_calls(
+        self, headers: Dict[str, str], start_date: datetime, end_date: datetime
+    ) -> int:
+        """Merge every call in a time range into the ledger.
+
+        Long ranges are split into chunks whose pages are fetched in
+        parallel, bounded by the request semaphore.
+        """
+        chunks = []
+        chunk_start = start_date
+        while chunk_start < end_date:
+            chunk_end = min(chunk_start + timedelta(seconds=CALLS_FETCH_CHUNK), end_date)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+
+        results = await asyncio.gather(
+            *(self._sync_chunk(headers, start, end) for start, end in chunks),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return sum(results)
+
+    async def _sync_chunk(
+        self, headers: Dict[str, str], start_date: datetime, end_date: datetime
+    ) -> int:
+        """Merge the calls of one chunk into the ledger page by page."""
+        new_calls = 0
+        # Fold each batch in as it is decoded instead of buffering the chunk
+        async for calls in self._fetch_call_pages(headers, start_date, end_date):
+            self.metrics.count(COUNTER_CALLS_PROCESSED, len(calls))
+            with self.metrics.time(STAGE_AGGREGATE):
+                new_calls += self._ledger.merge(calls)
+        return new_calls
+
+    async def _fetch_call_pages(
+        self, headers: Dict[str, str], start_date: datetime, end_date: datetime
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield every call of a time range in batches, page after page."""
+        # Format dates for API
+        start_str = format_timestamp(start_date)
+        end_str = format_timestamp(end_date)
+
+        url = f"{GOTO_API_BASE_URL}{CALLS_API_URL}"
+        page_marker: Optional[str] = None
+        seen_markers = set()
+
+        while True:
             params = {
                 "startTime": start_str,
                 "endTime": end_str,
-                "limit": 1000,  # Get maximum calls
+                "pageSize": CALLS_PAGE_SIZE,
             }
+            if page_marker:
+                params[CALLS_PAGE_MARKER_PARAM] = page_marker
 
-            async with self._session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._process_call_data(data)
-                else:
-                    _LOGGER.warning("Failed to fetch calls for %s: %s", period, response.status)
-                    return self._get_empty_stats()
+            decoder = CallPageDecoder()
+            async for calls in self._fetch_calls_page(url, headers, params, decoder):
+                yield calls
 
-        except Exception as e:
-            _LOGGER.error("Error fetching calls for %s: %s", period, e)
-            return self._get_empty_stats()
-
-    def _process_call_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process raw call data into statistics."""
-        calls = data.get("calls", [])
-        
-        total = len(calls)
-        incoming = 0
-        outgoing = 0
-        missed = 0
-        durations = []
-        
-        for call in calls:
-            call_type = call.get("type", "").lower()
-            duration = call.get("duration", 0)
-            
-            if "incoming" in call_type or "inbound" in call_type:
-                incoming += 1
-            elif "outgoing" in call_type or "outbound" in call_type:
-                outgoing += 1
-            elif "missed" in call_type:
-                missed += 1
-            
-            if duration and duration > 0:
-                durations.append(duration)
-        
-        return {
-            "total": total,
-            "incoming": incoming,
-            "outgoing": outgoing,
-            "missed": missed,
-            "durations": durations,
-            "average_duration": sum(durations) / len(durations) if durations else 0,
-        }
+            page_marker = decoder.next_page_marker
+            if not page_marker:
+                return
+            if page_marker in seen_markers:
+                raise CallFetchError(
+                    f"Calls endpoint returned page marker {page_marker} twice"
+                )
+            seen_markers.add(page_marker)
 
-    def _get_empty_stats(self) -> Dict[str, Any]:
-        """Return empty statistics structure."""
-        return {
-            "total": 0,
-            "incoming": 0,
-            "outgoing": 0,
-            "missed": 0,
-            "durations": [],
-            "average_duration": 0,
-        }
+    async def _fetch_calls_page(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        params: Dict[str, Any],
+        decoder: CallPageDecoder,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream a single page of raw call data in small batches."""
+        try:
+            async with self._request_slots:
+                started = time.perf_counter()
+                async with self._scheduler.request(
+                    self.session, "GET", url, self.metrics, headers=headers, params=params
+                ) as response:
+                    # Waiting for the rate limit and the response headers
+                    self.metrics.add_time(STAGE_NETWORK, time.perf_counter() - started)
+                    if response.status != 200:
+                        raise CallFetchError(
+                            f"Failed to fetch calls from {params['startTime']} "
+                            f"to {params['endTime']}: {response.status}"
+                        )
+                    # Decode off the byte stream rather than buffering the body
+                    async for calls in decoder.async_iter_calls(response.content):
+                        yield calls
+                    self.metrics.add_time(STAGE_NETWORK, decoder.read_time)
+                    self.metrics.add_time(STAGE_DECODE, decoder.decode_time)
+                    self.metrics.count(COUNTER_PAGES)
+                    self.metrics.count(COUNTER_BYTES_RECEIVED, decoder.bytes_read)
+        except RateLimitedError as e:
+            raise CallFetchError(str(e)) from e
+        except (aiohttp.ClientError, asyncio.TimeoutError, ijson.JSONError) as e:
+            raise CallFetchError(f"Error fetching calls: {e}") from e
 
     async def async_cleanup(self) -> None:
         """Clean up resources."""
-        if self._session and not self._session.closed:
-            await self._session.close() 
\ No newline at end of file
+        await self.backfill.async_stop()
+        await self._scheduler.async_unregister(self.entry.entry_id)
+        await self._store.async_close()
+
+
+class CallFetchError(HomeAssistantError):
+    """Error to indicate the calls window could not be fetched completely."""
@@ -0,0 +1,36 @@
+"""Diagnostics support for GoTo Connect Call Stats integration."""
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_CLIENT_ID, CONF_CLIENT_SECRET, "tokens"}
+USER_INFO_TO_REDACT = {"email", "emails", "firstName", "lastName", "phoneNumbers"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "polling": coordinator.polling_diagnostics,
+        "sync": coordinator.sync_diagnostics,
+        "scheduler": coordinator.request_scheduler.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "backfill": coordinator.backfill.as_dict(),
+        "last_update_success": coordinator.last_update_success,
+        "last_updated": data.get("last_updated"),
+        "user_info": async_redact_data(data.get("user_info", {}), USER_INFO_TO_REDACT),
+    }
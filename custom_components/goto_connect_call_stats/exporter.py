@@ -0,0 +1,329 @@
+"""OpenMetrics exporter for GoTo Connect Call Stats integration.
+
+Every config entry with the metrics endpoint enabled keeps a snapshot of
+its metrics, rendered to OpenMetrics sample lines whenever its
+coordinator updates. A scrape only joins the cached snapshots, so its
+cost does not depend on how many calls are held.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, DURATION_HISTOGRAM_BOUNDS, DURATION_PERCENTILES, PERIODS
+from .instrumentation import (
+    COUNTER_API_ERRORS,
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_CALLS_PROCESSED,
+    COUNTER_POLL_FAILURES,
+    COUNTER_POLLS,
+    COUNTER_REQUESTS,
+    COUNTER_RETRIES,
+    COUNTER_TOKEN_REFRESHES,
+    STAGES,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import GoToConnectCallStatsCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_METRICS_REGISTRY = "metrics_registry"
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_PREFIX = "goto_connect_"
+
+# Metric families in output order: name, type, unit and help text
+FAMILIES: Tuple[Tuple[str, str, str, str], ...] = (
+    ("info", "info", "", "GoTo Connect account"),
+    ("up", "gauge", "", "Whether the last poll succeeded"),
+    ("calls", "gauge", "", "Calls in the period by direction"),
+    (
+        "call_duration_seconds",
+        "gaugehistogram",
+        "seconds",
+        "Durations of the answered calls in the period",
+    ),
+    (
+        "call_duration_quantile_seconds",
+        "gauge",
+        "seconds",
+        "Call duration percentiles of the answered calls in the period",
+    ),
+    ("group_calls", "gauge", "", "Calls of a line, user or queue in the period by direction"),
+    ("calls_held", "gauge", "", "Calls held in memory"),
+    ("poll_stage_seconds", "gauge", "seconds", "Time of the last poll per stage"),
+    (
+        "poll_stage_quantile_seconds",
+        "gauge",
+        "seconds",
+        "Rolling percentiles of the poll time per stage",
+    ),
+    ("polls", "counter", "", "Polls run"),
+    ("poll_failures", "counter", "", "Polls that failed"),
+    ("api_requests", "counter", "", "API requests sent, retries included"),
+    ("api_retries", "counter", "", "API requests retried"),
+    ("api_errors", "counter", "", "API requests that failed after any retries"),
+    ("token_refreshes", "counter", "", "Access token refreshes"),
+    ("received_bytes", "counter", "bytes", "Bytes of calls pages received"),
+    ("calls_processed", "counter", "", "Calls decoded and merged, re-fetched ones included"),
+)
+
+# Counter families and the poll counters they report
+_COUNTER_FAMILIES = (
+    ("polls", COUNTER_POLLS),
+    ("poll_failures", COUNTER_POLL_FAILURES),
+    ("api_requests", COUNTER_REQUESTS),
+    ("api_retries", COUNTER_RETRIES),
+    ("api_errors", COUNTER_API_ERRORS),
+    ("token_refreshes", COUNTER_TOKEN_REFRESHES),
+    ("received_bytes", COUNTER_BYTES_RECEIVED),
+    ("calls_processed", COUNTER_CALLS_PROCESSED),
+)
+
+_DIRECTIONS = ("incoming", "outgoing", "missed")
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value."""
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _sample(name: str, labels: Dict[str, Any], value: float) -> str:
+    """Render one sample line."""
+    label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{_PREFIX}{name}{{{label_text}}} {_format_value(value)}\n"
+
+
+def _direction_samples(
+    name: str, labels: Dict[str, Any], stats: Dict[str, Any]
+) -> List[str]:
+    """Render the calls of a period by direction.
+
+    Calls of no known direction are reported as other, so the directions
+    add up to the total.
+    """
+    samples = []
+    remaining = stats.get("total", 0)
+    for direction in _DIRECTIONS:
+        count = stats.get(direction, 0)
+        remaining -= count
+        samples.append(_sample(name, {**labels, "direction": direction}, count))
+    samples.append(_sample(name, {**labels, "direction": "other"}, max(0, remaining)))
+    return samples
+
+
+class GoToMetricsExporter:
+    """Keep the rendered metrics of one config entry."""
+
+    def __init__(self, coordinator: "GoToConnectCallStatsCoordinator") -> None:
+        """Initialize the exporter."""
+        self.coordinator = coordinator
+        self.samples: Dict[str, List[str]] = {}
+        self._labels = {"entry_id": coordinator.entry.entry_id}
+
+    def render(self) -> None:
+        """Render the coordinator's current data and poll metrics."""
+        coordinator = self.coordinator
+        labels = self._labels
+        data = coordinator.data or {}
+        samples: Dict[str, List[str]] = {name: [] for name, *_ in FAMILIES}
+
+        samples["info"].append(
+            _sample("info_info", {**labels, "name": coordinator.entry.title}, 1)
+        )
+        samples["up"].append(_sample("up", labels, coordinator.last_update_success))
+
+        for period in PERIODS:
+            stats = data.get(period)
+            if not stats:
+                continue
+            period_labels = {**labels, "period": period}
+            samples["calls"].extend(_direction_samples("calls", period_labels, stats))
+
+            # Buckets are cumulative in OpenMetrics
+            histogram = samples["call_duration_seconds"]
+            cumulative = 0
+            bounds = [str(bound) for bound in DURATION_HISTOGRAM_BOUNDS] + ["+Inf"]
+            for bound, count in zip(bounds, stats["duration_histogram"].values()):
+                cumulative += count
+                histogram.append(
+                    _sample(
+                        "call_duration_seconds_bucket",
+                        {**period_labels, "le": bound},
+                        cumulative,
+                    )
+                )
+            histogram.append(
+                _sample("call_duration_seconds_gcount", period_labels, stats["answered"])
+            )
+            histogram.append(
+                _sample(
+                    "call_duration_seconds_gsum", period_labels, stats["total_duration"]
+                )
+            )
+
+            for percentile in DURATION_PERCENTILES:
+                value = stats["duration_percentiles"].get(f"p{percentile}")
+                if value is not None:
+                    samples["call_duration_quantile_seconds"].append(
+                        _sample(
+                            "call_duration_quantile_seconds",
+                            {**period_labels, "quantile": percentile / 100},
+                            value,
+                        )
+                    )
+
+        for dimension, groups in data.get("groups", {}).items():
+            for group_id, periods in groups.items():
+                for period, stats in periods.items():
+                    samples["group_calls"].extend(
+                        _direction_samples(
+                            "group_calls",
+                            {
+                                **labels,
+                                "dimension": dimension,
+                                "group": group_id,
+                                "period": period,
+                            },
+                            stats,
+                        )
+                    )
+
+        samples["calls_held"].append(
+            _sample("calls_held", labels, coordinator.sync_diagnostics["calls_held"])
+        )
+
+        metrics = coordinator.metrics
+        for stage in STAGES:
+            stage_labels = {**labels, "stage": stage}
+            last = metrics.last_poll.get(stage)
+            if last is not None:
+                samples["poll_stage_seconds"].append(
+                    _sample("poll_stage_seconds", stage_labels, last)
+                )
+            for percentile in (50, 95):
+                value = metrics.percentile(stage, percentile)
+                if value is not None:
+                    samples["poll_stage_quantile_seconds"].append(
+                        _sample(
+                            "poll_stage_quantile_seconds",
+                            {**stage_labels, "quantile": percentile / 100},
+                            value,
+                        )
+                    )
+
+        for name, counter in _COUNTER_FAMILIES:
+            samples[name].append(
+                _sample(f"{name}_total", labels, metrics.counters[counter])
+            )
+
+        self.samples = samples
+
+
+class GoToMetricsRegistry:
+    """Collect the exporters of every config entry for the metrics view.
+
+    The joined payload is cached until an exporter renders again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._exporters: Dict[str, GoToMetricsExporter] = {}
+        self._payload: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        """Return the number of config entries exported."""
+        return len(self._exporters)
+
+    @callback
+    def async_register(
+        self, coordinator: "GoToConnectCallStatsCoordinator"
+    ) -> Callable[[], None]:
+        """Export a coordinator's metrics; return a callback undoing it."""
+        entry_id = coordinator.entry.entry_id
+        exporter = GoToMetricsExporter(coordinator)
+        self._exporters[entry_id] = exporter
+
+        @callback
+        def _async_render() -> None:
+            """Render the snapshot after a coordinator update."""
+            exporter.render()
+            self._payload = None
+
+        _async_render()
+        remove_listener = coordinator.async_add_listener(_async_render)
+
+        @callback
+        def _async_unregister() -> None:
+            """Stop exporting the coordinator's metrics."""
+            remove_listener()
+            if self._exporters.get(entry_id) is exporter:
+                del self._exporters[entry_id]
+            self._payload = None
+
+        return _async_unregister
+
+    def payload(self) -> bytes:
+        """Return every exporter's metrics in OpenMetrics text format."""
+        if self._payload is None:
+            parts = []
+            for name, metric_type, unit, help_text in FAMILIES:
+                family = f"{_PREFIX}{name}"
+                parts.append(f"# TYPE {family} {metric_type}\n")
+                if unit:
+                    parts.append(f"# UNIT {family} {unit}\n")
+                parts.append(f"# HELP {family} {help_text}\n")
+                for exporter in self._exporters.values():
+                    parts.extend(exporter.samples.get(name, ()))
+            parts.append("# EOF\n")
+            self._payload = "".join(parts).encode()
+        return self._payload
+
+
+class GoToMetricsView(HomeAssistantView):
+    """Serve the metrics of every exported config entry."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, registry: GoToMetricsRegistry) -> None:
+        """Initialize the view."""
+        self._registry = registry
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the cached metrics."""
+        if not len(self._registry):
+            return web.Response(status=404, text="No config entry exports metrics")
+        return web.Response(
+            body=self._registry.payload(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+
+def get_metrics_registry(hass: HomeAssistant) -> GoToMetricsRegistry:
+    """Return the metrics registry, registering the view on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_METRICS_REGISTRY not in domain_data:
+        registry = GoToMetricsRegistry()
+        # Views cannot be removed, so it answers 404 once no entry exports
+        hass.http.register_view(GoToMetricsView(registry))
+        domain_data[DATA_METRICS_REGISTRY] = registry
+        _LOGGER.debug("Serving call stats metrics on %s", METRICS_URL)
+    return domain_data[DATA_METRICS_REGISTRY]
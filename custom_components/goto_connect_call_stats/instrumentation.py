@@ -0,0 +1,157 @@
+"""Poll instrumentation for GoTo Connect Call Stats integration."""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from .const import METRICS_SAMPLES
+
+# Stages of a poll. Pages of a long sync are fetched concurrently and
+# their times add up, so network and decode can exceed the poll total.
+STAGE_TOKEN = "token"
+STAGE_USER_INFO = "user_info"
+STAGE_NETWORK = "network"
+STAGE_DECODE = "decode"
+STAGE_AGGREGATE = "aggregate"
+STAGE_STORE = "store"
+STAGE_TOTAL = "total"
+STAGES = (
+    STAGE_TOKEN,
+    STAGE_USER_INFO,
+    STAGE_NETWORK,
+    STAGE_DECODE,
+    STAGE_AGGREGATE,
+    STAGE_STORE,
+    STAGE_TOTAL,
+)
+
+# Counters, cumulative since the integration was set up
+COUNTER_POLLS = "polls"
+COUNTER_POLL_FAILURES = "poll_failures"
+COUNTER_REQUESTS = "requests"
+COUNTER_RETRIES = "retries"
+COUNTER_API_ERRORS = "api_errors"
+COUNTER_PAGES = "pages"
+COUNTER_BYTES_RECEIVED = "bytes_received"
+COUNTER_CALLS_PROCESSED = "calls_processed"
+COUNTER_TOKEN_REFRESHES = "token_refreshes"
+COUNTER_USER_INFO_CACHED = "user_info_cached"
+COUNTER_USER_INFO_NOT_MODIFIED = "user_info_not_modified"
+COUNTER_USER_INFO_FETCHED = "user_info_fetched"
+COUNTERS = (
+    COUNTER_POLLS,
+    COUNTER_POLL_FAILURES,
+    COUNTER_REQUESTS,
+    COUNTER_RETRIES,
+    COUNTER_API_ERRORS,
+    COUNTER_PAGES,
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_CALLS_PROCESSED,
+    COUNTER_TOKEN_REFRESHES,
+    COUNTER_USER_INFO_CACHED,
+    COUNTER_USER_INFO_NOT_MODIFIED,
+    COUNTER_USER_INFO_FETCHED,
+)
+
+
+def _percentile(samples: Deque[float], percentile: float) -> Optional[float]:
+    """Return a percentile of the samples by nearest rank."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+class PollMetrics:
+    """Stage timings and counters of a coordinator's polls.
+
+    Each stage keeps the times of the last METRICS_SAMPLES polls in a
+    ring buffer, from which the rolling p50 and p95 are read; nothing
+    else about past polls is kept.
+    """
+
+    def __init__(self, samples: int = METRICS_SAMPLES) -> None:
+        """Initialize empty metrics."""
+        self._timings: Dict[str, Deque[float]] = {
+            stage: deque(maxlen=samples) for stage in STAGES
+        }
+        self._poll: Optional[Dict[str, float]] = None
+        self._poll_started = 0.0
+        self.last_poll: Dict[str, float] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    def start_poll(self) -> None:
+        """Start timing a poll."""
+        self._poll = dict.fromkeys(STAGES, 0.0)
+        self._poll_started = time.perf_counter()
+
+    def finish_poll(self) -> None:
+        """Record the stage timings of the poll in progress."""
+        if self._poll is None:
+            return
+        self._poll[STAGE_TOTAL] = time.perf_counter() - self._poll_started
+        for stage, seconds in self._poll.items():
+            self._timings[stage].append(seconds)
+        self.last_poll = self._poll
+        self._poll = None
+        self.counters[COUNTER_POLLS] += 1
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage to the poll in progress, if any."""
+        if self._poll is not None:
+            self._poll[stage] += seconds
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time a block as part of a stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self.counters[counter] += amount
+
+    def percentile(self, stage: str, percentile: float) -> Optional[float]:
+        """Return a rolling percentile of a stage's time in seconds."""
+        return _percentile(self._timings[stage], percentile)
+
+    @property
+    def user_info_hit_rate(self) -> Optional[float]:
+        """Return the share of polls served user info without a full fetch."""
+        hits = (
+            self.counters[COUNTER_USER_INFO_CACHED]
+            + self.counters[COUNTER_USER_INFO_NOT_MODIFIED]
+        )
+        lookups = hits + self.counters[COUNTER_USER_INFO_FETCHED]
+        return hits / lookups if lookups else None
+
+    @property
+    def token_hit_rate(self) -> Optional[float]:
+        """Return the share of polls that used the cached access token."""
+        polls = self.counters[COUNTER_POLLS]
+        if not polls:
+            return None
+        return max(0.0, 1 - self.counters[COUNTER_TOKEN_REFRESHES] / polls)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "stages": {
+                stage: {
+                    "last": self.last_poll.get(stage),
+                    "p50": self.percentile(stage, 50),
+                    "p95": self.percentile(stage, 95),
+                    "samples": len(self._timings[stage]),
+                }
+                for stage in STAGES
+            },
+            "counters": dict(self.counters),
+            "cache_hit_rates": {
+                "user_info": self.user_info_hit_rate,
+                "token": self.token_hit_rate,
+            },
+        }
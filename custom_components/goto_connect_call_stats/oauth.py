@@ -1,11 +1,13 @@
 """OAuth2 token management for GoTo Connect Call Stats integration."""
 
+import asyncio
 import json
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
+import aiohttp
 import requests
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -25,10 +27,26 @@ from .const import (
     OAUTH2_AUTHORIZE_URL,
     OAUTH2_SCOPE,
     OAUTH2_TOKEN_URL,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_REQUEST_TIMEOUT,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+DATA_OAUTH_MANAGERS = "oauth_managers"
+
+
+def get_oauth_manager(hass: HomeAssistant, config_entry: ConfigEntry) -> "GoToOAuth2Manager":
+    """Return the shared OAuth2 manager for a config entry.
+
+    Every caller for the same entry shares one manager, so they share the
+    cached token and a single in-flight refresh.
+    """
+    managers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_OAUTH_MANAGERS, {})
+    if config_entry.entry_id not in managers:
+        managers[config_entry.entry_id] = GoToOAuth2Manager(hass, config_entry)
+    return managers[config_entry.entry_id]
+
 
 class GoToOAuth2Manager:
     """Manages OAuth2 tokens for GoTo Connect API."""
@@ -54,31 +72,33 @@ class GoToOAuth2Manager:
             scope=OAUTH2_SCOPE,
         )
         self._tokens = {}
+        self._refresh_lock = asyncio.Lock()
+        # Successful token refreshes, for poll instrumentation
+        self.refresh_count = 0
 
     def load_tokens(self) -> bool:
-        """Load tokens from config entry."""
+        """Load tokens from config entry into the in-memory cache."""
         try:
+            # Tokens are only read from the config entry once; refreshes
+            # update the cache and write through to the entry
+            if self._tokens.get(CONF_ACCESS_TOKEN):
+                return True
+
             if self.config_entry is None:
                 _LOGGER.warning("No config entry available for token loading")
                 return False
 
-            _LOGGER.info(
-                "Loading tokens from config entry. Config entry data: %s",
-                self.config_entry.data,
-            )
-
             tokens = self.config_entry.data.get("tokens", {})
-            _LOGGER.info("Found tokens in config entry: %s", tokens)
-
             if not tokens:
                 _LOGGER.warning("No tokens found in config entry")
                 return False
 
-            self._tokens = tokens
-            _LOGGER.info("Tokens loaded into memory: %s", self._tokens)
+            self._tokens = dict(tokens)
 
-            if not self._validate_tokens():
-                _LOGGER.warning("Invalid or expired tokens found")
+            # Expiry is handled by async_get_headers, which refreshes without
+            # blocking the event loop
+            if not self._tokens.get(CONF_ACCESS_TOKEN):
+                _LOGGER.warning("No access token found")
                 return False
 
             _LOGGER.info("Tokens loaded successfully")
@@ -97,7 +117,9 @@ class GoToOAuth2Manager:
 
             # Update the config entry with new tokens
             data = dict(self.config_entry.data)
-            data["tokens"] = self._tokens
+            # A copy, so the next refresh cannot change the entry's data in
+            # place and make this update look like a no-op
+            data["tokens"] = dict(self._tokens)
 
             # Update the config entry
             self.hass.async_create_task(
@@ -115,33 +137,6 @@ class GoToOAuth2Manager:
         """Update config entry asynchronously."""
         self.hass.config_entries.async_update_entry(self.config_entry, data=data)
 
-    def _validate_tokens(self) -> bool:
-        """Validate that tokens exist and are not expired."""
-        try:
-            if not self._tokens:
-                _LOGGER.warning("No tokens to validate")
-                return False
-
-            access_token = self._tokens.get(CONF_ACCESS_TOKEN)
-            if not access_token:
-                _LOGGER.warning("No access token found")
-                return False
-
-            # Check if token is expired
-            expires_at = self._tokens.get(CONF_TOKEN_EXPIRES_AT)
-            if expires_at:
-                current_time = datetime.now().timestamp()
-                if current_time >= expires_at:
-                    _LOGGER.info("Token is expired, attempting refresh")
-                    return self.refresh_tokens()
-
-            _LOGGER.info("Tokens are valid")
-            return True
-
-        except Exception as e:
-            _LOGGER.error("Token validation failed: %s", e)
-            return False
-
     def get_authorization_url(self) -> str:
         """Get the authorization URL for OAuth2 flow."""
         try:
@@ -267,8 +262,8 @@ class GoToOAuth2Manager:
             _LOGGER.error("Failed to fetch tokens: %s", e)
             return False
 
-    def refresh_tokens(self) -> bool:
-        """Refresh the access token using the refresh token."""
+    async def async_refresh_tokens(self, session: aiohttp.ClientSession) -> bool:
+        """Refresh the access token without blocking the event loop."""
         try:
             refresh_token = self._tokens.get(CONF_REFRESH_TOKEN)
             if not refresh_token:
@@ -284,47 +279,67 @@ class GoToOAuth2Manager:
                 'refresh_token': refresh_token
             }
 
-            response = requests.post(OAUTH2_TOKEN_URL, data=token_data)
-            response.raise_for_status()
+            async with session.post(
+                OAUTH2_TOKEN_URL,
+                data=token_data,
+                timeout=aiohttp.ClientTimeout(total=TOKEN_REQUEST_TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+                tokens = await response.json()
 
-            tokens = response.json()
             _LOGGER.info("Successfully refreshed tokens")
 
-            # Update tokens
-            self._tokens.update({
-                CONF_ACCESS_TOKEN: tokens.get('access_token'),
-                CONF_REFRESH_TOKEN: tokens.get('refresh_token', refresh_token),  # Keep old refresh token if new one not provided
-                CONF_TOKEN_EXPIRES_AT: datetime.now().timestamp() + tokens.get('expires_in', 3600)
-            })
-
-            # Save updated tokens
-            self.save_tokens()
-
+            self._update_tokens(tokens, refresh_token)
             return True
 
         except Exception as e:
             _LOGGER.error("Failed to refresh tokens: %s", e)
             return False
 
-    def get_valid_token(self) -> Optional[str]:
-        """Get a valid access token, refreshing if necessary."""
-        try:
-            if not self._validate_tokens():
-                _LOGGER.warning("No valid tokens available")
-                return None
-
-            return self._tokens.get(CONF_ACCESS_TOKEN)
+    def _update_tokens(self, tokens: Dict[str, Any], refresh_token: str) -> None:
+        """Store a token endpoint response and persist it."""
+        self.refresh_count += 1
+        self._tokens.update({
+            CONF_ACCESS_TOKEN: tokens.get('access_token'),
+            CONF_REFRESH_TOKEN: tokens.get('refresh_token', refresh_token),  # Keep old refresh token if new one not provided
+            CONF_TOKEN_EXPIRES_AT: datetime.now().timestamp() + tokens.get('expires_in', 3600)
+        })
+
+        # Save updated tokens
+        self.save_tokens()
+
+    def _needs_refresh(self) -> bool:
+        """Return True if the access token expires within the refresh margin."""
+        expires_at = self._tokens.get(CONF_TOKEN_EXPIRES_AT)
+        if not expires_at:
+            return False
+        return datetime.now().timestamp() >= expires_at - TOKEN_REFRESH_MARGIN
 
-        except Exception as e:
-            _LOGGER.error("Failed to get valid token: %s", e)
-            return None
+    def _is_expired(self) -> bool:
+        """Return True if the access token has expired."""
+        expires_at = self._tokens.get(CONF_TOKEN_EXPIRES_AT)
+        return bool(expires_at) and datetime.now().timestamp() >= expires_at
 
-    def get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests."""
-        token = self.get_valid_token()
-        if not token:
+    async def async_get_headers(self, session: aiohttp.ClientSession) -> Dict[str, str]:
+        """Get headers for API requests, refreshing the token ahead of expiry."""
+        if not self._tokens.get(CONF_ACCESS_TOKEN):
             raise ValueError("No valid access token available")
 
+        if self._needs_refresh():
+            # Concurrent callers wait for the refresh already in flight
+            # instead of each posting the same refresh token
+            async with self._refresh_lock:
+                if self._needs_refresh():
+                    refreshed = await self.async_refresh_tokens(session)
+                    # A token still inside its margin stays usable if the
+                    # refresh fails
+                    if not refreshed and self._is_expired():
+                        raise ValueError("No valid access token available")
+
+        return self._build_headers(self._tokens[CONF_ACCESS_TOKEN])
+
+    def _build_headers(self, token: str) -> Dict[str, str]:
+        """Build the API request headers for an access token."""
         return {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json',
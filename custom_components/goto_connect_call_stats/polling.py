@@ -0,0 +1,104 @@
+"""Adaptive polling interval for GoTo Connect Call Stats integration."""
+
+import logging
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_BUSINESS_INTERVAL,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    UPDATE_INTERVAL,
+    WEEKDAYS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+REASON_ACTIVITY = "recent_activity"
+REASON_BUSINESS_HOURS = "business_hours"
+REASON_IDLE = "idle_backoff"
+
+
+def parse_time(value: Optional[str]) -> Optional[time]:
+    """Parse an HH:MM[:SS] option value."""
+    if not value:
+        return None
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        _LOGGER.warning("Ignoring invalid business hours time: %s", value)
+        return None
+
+
+class AdaptivePollInterval:
+    """Pick the next poll interval from recent call activity and the clock.
+
+    Polls that found new calls drop the interval to the minimum. Quiet
+    polls inside business hours use the business interval, shorter than
+    the base, and quiet polls outside them back off geometrically from the
+    base towards the ceiling.
+    """
+
+    def __init__(
+        self,
+        business_days: List[str],
+        business_start: Optional[time],
+        business_end: Optional[time],
+        base: float = UPDATE_INTERVAL,
+        minimum: float = ADAPTIVE_MIN_INTERVAL,
+        maximum: float = ADAPTIVE_MAX_INTERVAL,
+        business: float = ADAPTIVE_BUSINESS_INTERVAL,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.business_days = business_days
+        self.business_start = business_start
+        self.business_end = business_end
+        self.base = base
+        self.business = business
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = base
+        self.reason = REASON_BUSINESS_HOURS
+
+    def in_business_hours(self, now: datetime) -> bool:
+        """Return True if a local time falls within the business hours."""
+        if self.business_start is None or self.business_end is None:
+            return False
+        if WEEKDAYS[now.weekday()] not in self.business_days:
+            return False
+
+        current = now.time()
+        if self.business_start <= self.business_end:
+            return self.business_start <= current < self.business_end
+        # Business hours that run past midnight
+        return current >= self.business_start or current < self.business_end
+
+    def update(self, now: datetime, new_calls: int) -> Tuple[timedelta, str]:
+        """Return the interval until the next poll and why it was chosen."""
+        if new_calls > 0:
+            self.interval, self.reason = self.minimum, REASON_ACTIVITY
+        elif self.in_business_hours(now):
+            self.interval, self.reason = self.business, REASON_BUSINESS_HOURS
+        else:
+            self.interval = min(
+                self.maximum, max(self.base, self.interval * ADAPTIVE_BACKOFF_FACTOR)
+            )
+            self.reason = REASON_IDLE
+
+        return timedelta(seconds=self.interval), self.reason
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the current state for diagnostics."""
+        return {
+            "interval": self.interval,
+            "reason": self.reason,
+            "minimum": self.minimum,
+            "business_interval": self.business,
+            "maximum": self.maximum,
+            "business_days": self.business_days,
+            "business_start": (
+                self.business_start.isoformat() if self.business_start else None
+            ),
+            "business_end": self.business_end.isoformat() if self.business_end else None,
+        }
@@ -0,0 +1,309 @@
+"""Shared request scheduling for GoTo Connect Call Stats integration.
+
+One scheduler serves every config entry: it owns the connection pool,
+rate limits and caps the requests sent to the API, and spreads the
+polls of the entries across their interval.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from yarl import URL
+
+from .const import (
+    DOMAIN,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_IN_FLIGHT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_REQUEST_TIMEOUT,
+    RATE_LIMIT_BACKOFF_BASE,
+    RATE_LIMIT_BACKOFF_MAX,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_PER_SECOND,
+)
+from .instrumentation import COUNTER_REQUESTS, COUNTER_RETRIES, PollMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_REQUEST_SCHEDULER = "request_scheduler"
+
+# Statuses worth retrying after a pause
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def get_request_scheduler(hass: HomeAssistant) -> "GoToRequestScheduler":
+    """Return the request scheduler shared by every config entry."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_REQUEST_SCHEDULER not in domain_data:
+        domain_data[DATA_REQUEST_SCHEDULER] = GoToRequestScheduler()
+    return domain_data[DATA_REQUEST_SCHEDULER]
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the Retry-After delay in seconds, if the response has one."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        _LOGGER.debug("Ignoring unparsable Retry-After header: %s", value)
+        return None
+
+
+class RateLimitedError(HomeAssistantError):
+    """Error to indicate the API kept throttling after every retry."""
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to one API host."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def paused_until(self) -> float:
+        """Return the monotonic time until which requests are held back."""
+        return self._paused_until
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, delay: float) -> None:
+        """Hold back every request to this host for a while."""
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Pause when the rate-limit headers say the quota is used up."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        try:
+            if int(remaining) > 0:
+                return
+            reset_at = float(reset)
+        except ValueError:
+            return
+
+        # The reset is either an epoch timestamp or a number of seconds
+        delay = reset_at - time.time() if reset_at > 1e9 else reset_at
+        if delay > 0:
+            self.pause(delay)
+
+
+class GoToRequestScheduler:
+    """Send API requests through per-host token buckets with retries.
+
+    Throttled (429) and unavailable (5xx) responses are retried with
+    jittered exponential backoff, honouring Retry-After when present.
+    Every config entry shares the scheduler's session and its cap on
+    requests in flight.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        max_retries: int = RATE_LIMIT_MAX_RETRIES,
+        max_in_flight: int = HTTP_MAX_IN_FLIGHT,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.max_in_flight = max_in_flight
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._entries: List[str] = []
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session shared by every config entry."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=HTTP_REQUEST_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT
+                ),
+            )
+        return self._session
+
+    def register(self, entry_id: str) -> None:
+        """Start scheduling the polls of a config entry."""
+        if entry_id not in self._entries:
+            self._entries.append(entry_id)
+
+    async def async_unregister(self, entry_id: str) -> None:
+        """Stop scheduling a config entry, closing the pool after the last."""
+        if entry_id in self._entries:
+            self._entries.remove(entry_id)
+        if not self._entries and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def stagger(self, entry_id: str, interval: timedelta) -> timedelta:
+        """Return the delay until the next poll slot of a config entry.
+
+        Entries are given evenly spaced phases within the interval, and
+        each poll is aligned to its entry's phase, so polls of several
+        entries never line up however long each one takes.
+        """
+        seconds = interval.total_seconds()
+        if entry_id not in self._entries or seconds <= 0:
+            return interval
+
+        phase = seconds * self._entries.index(entry_id) / len(self._entries)
+        delay = seconds - (time.time() - phase) % seconds
+        # Never poll much sooner than asked, e.g. after phases shift
+        if delay < seconds / 2:
+            delay += seconds
+        return timedelta(seconds=delay)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the shared scheduling state for diagnostics."""
+        return {
+            "entries": len(self._entries),
+            "in_flight_limit": self.max_in_flight,
+            "paused_hosts": [
+                host
+                for host, bucket in self._buckets.items()
+                if bucket.paused_until > time.monotonic()
+            ],
+        }
+
+    def _bucket(self, url: str) -> TokenBucket:
+        """Return the token bucket of the host a URL points to."""
+        host = URL(url).host or ""
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def _backoff(self, attempt: int) -> float:
+        """Return the jittered exponential backoff for a retry attempt."""
+        delay = min(RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * 2**attempt)
+        return random.uniform(delay / 2, delay)
+
+    @asynccontextmanager
+    async def request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        metrics: Optional[PollMetrics] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request, retrying throttled and unavailable responses.
+
+        Every attempt and retry is counted in the caller's metrics, if
+        given.
+        """
+        bucket = self._bucket(url)
+        attempt = 0
+
+        while True:
+            await bucket.async_acquire()
+            # The slot is held until the response has been consumed, but
+            # not while waiting to retry
+            await self._in_flight.acquire()
+            if metrics is not None:
+                metrics.count(COUNTER_REQUESTS)
+                if attempt:
+                    metrics.count(COUNTER_RETRIES)
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self._in_flight.release()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                _LOGGER.debug("Retrying %s in %.1fs after %s", url, delay, e)
+            except BaseException:
+                self._in_flight.release()
+                raise
+            else:
+                bucket.update_from_headers(response.headers)
+                if response.status not in RETRY_STATUSES:
+                    break
+
+                retry_after = parse_retry_after(response.headers)
+                response.release()
+                self._in_flight.release()
+                if attempt >= self.max_retries:
+                    if response.status == 429:
+                        raise RateLimitedError(
+                            f"Rate limited by {URL(url).host} after "
+                            f"{attempt + 1} attempts"
+                        )
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=response.reason or "",
+                    )
+
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if response.status == 429:
+                    # Hold back every request to this host, not just this one
+                    bucket.pause(delay)
+                _LOGGER.debug(
+                    "Retrying %s in %.1fs after status %s", url, delay, response.status
+                )
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        try:
+            yield response
+        finally:
+            response.release()
+            self._in_flight.release()
@@ -0,0 +1,331 @@
+"""Realtime call events for GoTo Connect Call Stats integration."""
+
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .aggregator import parse_timestamp
+from .const import (
+    CALL_EVENTS_SUBSCRIPTIONS_API_URL,
+    DOMAIN,
+    GOTO_API_BASE_URL,
+    NOTIFICATION_CHANNEL_API_URL,
+    NOTIFICATION_CHANNEL_NICKNAME,
+    NOTIFICATION_CHANNEL_RENEW_MARGIN,
+    RATE_LIMIT_BACKOFF_MAX,
+    REALTIME_FLUSH_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Default channel lifetime when the API does not say (seconds)
+DEFAULT_CHANNEL_LIFETIME = 7 * 86400
+
+
+def call_from_event(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert an ended call event into the call shape of the calls endpoint.
+
+    Returns None for events that do not describe a finished call.
+    """
+    content = event.get("data", {}).get("content", event)
+    state = content.get("state") or {}
+    if str(state.get("type", "")).upper() != "ENDING":
+        return None
+
+    metadata = content.get("metadata") or {}
+    call_id = metadata.get("conversationSpaceId") or content.get("callId")
+    created = parse_timestamp(metadata.get("callCreated"))
+    if not call_id or created is None:
+        return None
+
+    answered = parse_timestamp(metadata.get("callAnswered"))
+    ended = parse_timestamp(metadata.get("callEnded") or state.get("timestamp"))
+    duration = 0
+    if answered is not None and ended is not None:
+        duration = max(0, int((ended - answered).total_seconds()))
+
+    direction = str(metadata.get("direction", "")).lower()
+    call_type = "missed" if direction == "inbound" and answered is None else direction
+
+    return {
+        "id": call_id,
+        # Full precision, like the startTime of the calls endpoint
+        "startTime": created.isoformat() + "Z",
+        "duration": duration,
+        "type": call_type,
+    }
+
+
+class GoToCallEventListener:
+    """Consume call events from a GoTo notification channel.
+
+    Ended calls are merged into the coordinator as they arrive. One channel
+    is kept for the life of the listener: the websocket is reconnected to
+    it with backoff when it drops, its lifetime is extended before it
+    expires, and it is only recreated when the API no longer knows it. The
+    channel, and the subscription bound to it, is deleted on stop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator,
+        api_base_url: str = GOTO_API_BASE_URL,
+    ) -> None:
+        """Initialize the listener."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.api_base_url = api_base_url
+        self._task: Optional[asyncio.Task] = None
+        self._attempt = 0
+        # Id, websocket URL, expiry (loop time) and subscription state
+        self._channel: Optional[Dict[str, Any]] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        self._unsub_retry: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def account_key(self) -> Optional[str]:
+        """Return the account the call events are subscribed for."""
+        user_info = (self.coordinator.data or {}).get("user_info", {})
+        return user_info.get("accountKey")
+
+    @callback
+    def async_start(self) -> None:
+        """Start consuming call events in the background.
+
+        Without an account key yet, e.g. when user info failed to load,
+        the entry keeps polling and the start is retried on every update.
+        """
+        if not self.account_key:
+            if self._unsub_retry is None:
+                _LOGGER.warning(
+                    "No account key in user info, polling until call events "
+                    "can be subscribed"
+                )
+                self._unsub_retry = self.coordinator.async_add_listener(
+                    self._async_retry_start
+                )
+            return
+
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} call events"
+        )
+
+    @callback
+    def _async_retry_start(self) -> None:
+        """Start once an update brings the account key."""
+        if self.account_key and self._task is None:
+            self.async_start()
+
+    async def async_stop(self) -> None:
+        """Stop consuming call events and delete the channel."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._channel is not None:
+            channel_id = self._channel["id"]
+            self._channel = None
+            try:
+                headers = await self.coordinator.oauth_manager.async_get_headers(
+                    self.coordinator.session
+                )
+                await self._async_request(
+                    "DELETE",
+                    f"{NOTIFICATION_CHANNEL_API_URL}/"
+                    f"{NOTIFICATION_CHANNEL_NICKNAME}/{channel_id}",
+                    headers,
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # The API drops it when its lifetime runs out
+                _LOGGER.debug(
+                    "Failed to delete call event channel %s: %s", channel_id, e
+                )
+            else:
+                _LOGGER.debug("Deleted call event channel %s", channel_id)
+
+    async def _async_run(self) -> None:
+        """Keep the channel connected, backing off after failures."""
+        self._attempt = 0
+        while True:
+            try:
+                await self._async_listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Poll at the regular interval until subscribed again
+                self.coordinator.async_set_realtime_active(False)
+                delay = min(RATE_LIMIT_BACKOFF_MAX, 2**self._attempt)
+                delay = random.uniform(delay / 2, delay)
+                _LOGGER.warning(
+                    "Call event channel failed, reconnecting in %.0fs: %s", delay, e
+                )
+                self._attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _async_listen(self) -> None:
+        """Ready the channel and consume its call events.
+
+        Returns when the channel is due for renewal.
+        """
+        session = self.coordinator.session
+        headers = await self.coordinator.oauth_manager.async_get_headers(session)
+        loop = self.hass.loop
+
+        margin = NOTIFICATION_CHANNEL_RENEW_MARGIN
+        channel = self._channel
+        if channel is not None and channel["expires"] - loop.time() < margin:
+            await self._async_renew_channel(headers)
+        if self._channel is None:
+            await self._async_create_channel(headers)
+        channel = self._channel
+
+        if not channel["subscribed"]:
+            await self._async_request(
+                "POST",
+                CALL_EVENTS_SUBSCRIPTIONS_API_URL,
+                headers,
+                {
+                    "channelId": channel["id"],
+                    "accountKeys": [{"id": self.account_key, "events": ["ENDING"]}],
+                },
+            )
+            channel["subscribed"] = True
+            _LOGGER.debug("Subscribed to call events on channel %s", channel["id"])
+
+        try:
+            # Renew the channel ahead of its expiry
+            async with asyncio.timeout(
+                max(60, channel["expires"] - loop.time() - margin)
+            ):
+                try:
+                    ws = await session.ws_connect(channel["url"], heartbeat=30)
+                except aiohttp.WSServerHandshakeError as e:
+                    if e.status in (404, 410):
+                        # Expired or deleted server side, nothing to clean up
+                        self._channel = None
+                    raise
+                try:
+                    self._attempt = 0
+                    self.coordinator.async_set_realtime_active(True)
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_message(message.data)
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            raise ws.exception() or ConnectionError(
+                                "Call event channel error"
+                            )
+                finally:
+                    await ws.close()
+        except TimeoutError:
+            _LOGGER.debug("Renewing call event channel %s", channel["id"])
+            return
+
+        raise ConnectionError("Call event channel closed")
+
+    async def _async_create_channel(self, headers: Dict[str, str]) -> None:
+        """Create a notification channel; it is subscribed separately."""
+        data = await self._async_request(
+            "POST",
+            f"{NOTIFICATION_CHANNEL_API_URL}/{NOTIFICATION_CHANNEL_NICKNAME}",
+            headers,
+            {"channelType": "WebSockets"},
+        )
+        lifetime = data.get("channelLifetime") or DEFAULT_CHANNEL_LIFETIME
+        self._channel = {
+            "id": data["channelId"],
+            "url": data["channelData"]["channelURL"],
+            "expires": self.hass.loop.time() + lifetime,
+            "subscribed": False,
+        }
+        _LOGGER.debug("Created call event channel %s", self._channel["id"])
+
+    async def _async_renew_channel(self, headers: Dict[str, str]) -> None:
+        """Extend the lifetime of the channel, forgetting it if it is gone."""
+        channel = self._channel
+        try:
+            data = await self._async_request(
+                "PUT",
+                f"{NOTIFICATION_CHANNEL_API_URL}/{NOTIFICATION_CHANNEL_NICKNAME}/"
+                f"{channel['id']}/channel-lifetime",
+                headers,
+                {"channelLifetime": DEFAULT_CHANNEL_LIFETIME},
+            )
+        except aiohttp.ClientResponseError as e:
+            if e.status not in (404, 410):
+                raise
+            _LOGGER.debug("Call event channel %s expired", channel["id"])
+            self._channel = None
+            return
+        lifetime = data.get("channelLifetime") or DEFAULT_CHANNEL_LIFETIME
+        channel["expires"] = self.hass.loop.time() + lifetime
+
+    async def _async_request(
+        self,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Send a request to the GoTo API through the request scheduler."""
+        async with self.coordinator.request_scheduler.request(
+            self.coordinator.session,
+            method,
+            f"{self.api_base_url}{path}",
+            self.coordinator.metrics,
+            headers=headers,
+            json=payload,
+        ) as response:
+            response.raise_for_status()
+            # Deletes answer without a body
+            body = await response.read()
+            return json.loads(body) if body else {}
+
+    @callback
+    def _handle_message(self, raw: str) -> None:
+        """Queue the call carried by a channel message, if any."""
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            _LOGGER.debug("Ignoring malformed call event: %s", raw[:100])
+            return
+
+        call = call_from_event(event) if isinstance(event, dict) else None
+        if call is None:
+            return
+
+        # Batch bursts of events into a single recompute
+        self._pending.append(call)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, REALTIME_FLUSH_DELAY, self._async_flush
+            )
+
+    async def _async_flush(self, _now: datetime) -> None:
+        """Merge the queued calls into the coordinator."""
+        self._unsub_flush = None
+        calls, self._pending = self._pending, []
+        if calls:
+            await self.coordinator.async_ingest_calls(calls)
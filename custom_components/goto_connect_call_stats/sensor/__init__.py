@@ -1,9 +1,10 @@
 """Sensor platform for GoTo Connect Call Stats integration."""
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from ..const import DURATION_PERCENTILES, PERIODS
 from .sensor import (
     GoToConnectTotalCallsSensor,
     GoToConnectIncomingCallsSensor,
@@ -14,6 +15,14 @@ from .sensor import (
     GoToConnectTodayCallsSensor,
     GoToConnectWeekCallsSensor,
     GoToConnectMonthCallsSensor,
+    GoToConnectDurationPercentileSensor,
+    GoToConnectDurationDistributionSensor,
+    GoToConnectGroupCallsSensor,
+    GoToConnectPollDurationSensor,
+    GoToConnectApiRequestsSensor,
+    GoToConnectBytesReceivedSensor,
+    GoToConnectCallsProcessedSensor,
+    GoToConnectUserInfoCacheHitRateSensor,
 )
 
 
@@ -35,6 +44,39 @@ async def async_setup_entry(
         GoToConnectTodayCallsSensor(coordinator),
         GoToConnectWeekCallsSensor(coordinator),
         GoToConnectMonthCallsSensor(coordinator),
+        GoToConnectPollDurationSensor(coordinator),
+        GoToConnectApiRequestsSensor(coordinator),
+        GoToConnectBytesReceivedSensor(coordinator),
+        GoToConnectCallsProcessedSensor(coordinator),
+        GoToConnectUserInfoCacheHitRateSensor(coordinator),
     ]
 
-    async_add_entities(sensors) 
\ No newline at end of file
+    for period in PERIODS:
+        sensors.extend(
+            GoToConnectDurationPercentileSensor(coordinator, period, percentile)
+            for percentile in DURATION_PERCENTILES
+        )
+        sensors.append(GoToConnectDurationDistributionSensor(coordinator, period))
+
+    async_add_entities(sensors)
+
+    # Lines, users and queues get a sensor once calls for them show up
+    known_groups = set()
+
+    @callback
+    def _async_add_group_sensors() -> None:
+        """Add a sensor for every group not seen before."""
+        groups = (coordinator.data or {}).get("groups", {})
+        new_sensors = []
+        for dimension, group_stats in groups.items():
+            for group_id in group_stats:
+                if (dimension, group_id) not in known_groups:
+                    known_groups.add((dimension, group_id))
+                    new_sensors.append(
+                        GoToConnectGroupCallsSensor(coordinator, dimension, group_id)
+                    )
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+    _async_add_group_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_group_sensors)) 
\ No newline at end of file
@@ -3,39 +3,84 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from ..const import (
     DEFAULT_NAME,
     DOMAIN,
+    GROUP_LINE,
+    GROUP_QUEUE,
+    GROUP_USER,
+    PERIOD_MONTH,
+    PERIOD_TODAY,
+    PERIOD_WEEK,
+    SENSOR_API_REQUESTS,
     SENSOR_AVERAGE_CALL_DURATION,
+    SENSOR_BYTES_RECEIVED,
     SENSOR_CALL_DURATION,
+    SENSOR_CALLS_PROCESSED,
+    SENSOR_DURATION_DISTRIBUTION,
+    SENSOR_DURATION_PERCENTILE,
+    SENSOR_GROUP_CALLS,
     SENSOR_INCOMING_CALLS,
     SENSOR_MISSED_CALLS,
     SENSOR_MONTH_CALLS,
     SENSOR_OUTGOING_CALLS,
+    SENSOR_POLL_DURATION,
     SENSOR_TODAY_CALLS,
     SENSOR_TOTAL_CALLS,
+    SENSOR_USER_INFO_CACHE_HIT_RATE,
     SENSOR_WEEK_CALLS,
 )
+from ..instrumentation import (
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_CALLS_PROCESSED,
+    COUNTER_REQUESTS,
+    STAGE_TOTAL,
+    STAGES,
+)
+
+PERIOD_NAMES = {
+    PERIOD_TODAY: "Today",
+    PERIOD_WEEK: "This Week",
+    PERIOD_MONTH: "This Month",
+}
+
+GROUP_NAMES = {
+    GROUP_LINE: "Line",
+    GROUP_USER: "User",
+    GROUP_QUEUE: "Queue",
+}
 
 
 class GoToConnectCallStatsSensor(CoordinatorEntity, SensorEntity):
     """Base class for GoTo Connect Call Stats sensors."""
 
+    # Suffix of the unique ID, which is prefixed with the config entry ID
+    _sensor_key: str
+
     def __init__(self, coordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
+        entry = coordinator.entry
+        self._attr_unique_id = f"{entry.entry_id}_{self._sensor_key}"
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, "goto_connect_call_stats")},
-            name=DEFAULT_NAME,
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title or DEFAULT_NAME,
             manufacturer="GoTo Connect",
             model="Call Statistics",
         )
+        self._published: Optional[tuple] = None
 
     @property
     def available(self) -> bool:
@@ -45,21 +90,51 @@ class GoToConnectCallStatsSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        data = self.coordinator.data
-        if not data:
-            return {}
+        # Shared data such as the user info is left to diagnostics so it is
+        # not recorded with the state of every sensor
+        return {}
+
+    def _current_state(self) -> tuple:
+        """Return everything the written state is made of."""
+        return (self.available, self.native_value, self.extra_state_attributes)
 
-        return {
-            "last_updated": data.get("last_updated"),
-            "user_info": data.get("user_info", {}),
-        }
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._published = self._current_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if a refresh changed it."""
+        current = self._current_state()
+        if current == self._published:
+            return
+        self._published = current
+        self.async_write_ha_state()
+
+
+class GoToConnectDailySensor(GoToConnectCallStatsSensor):
+    """Base class for sensors counting since local midnight.
+
+    A re-synced call can be corrected or dropped, so these counts may dip
+    during the day. The recorder takes a dip of a total increasing sensor
+    for a meter reset; a total with its last reset at local midnight is
+    counted down instead.
+    """
+
+    _attr_state_class = SensorStateClass.TOTAL
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return the local midnight the count started at."""
+        return dt_util.start_of_local_day()
 
 
-class GoToConnectTotalCallsSensor(GoToConnectCallStatsSensor):
+class GoToConnectTotalCallsSensor(GoToConnectDailySensor):
     """Sensor for total calls today."""
 
     _attr_name = "Total Calls Today"
-    _attr_unique_id = f"{DOMAIN}_total_calls"
+    _sensor_key = SENSOR_TOTAL_CALLS
     _attr_native_unit_of_measurement = "calls"
 
     @property
@@ -71,11 +146,11 @@ class GoToConnectTotalCallsSensor(GoToConnectCallStatsSensor):
         return data.get("total_calls", 0)
 
 
-class GoToConnectIncomingCallsSensor(GoToConnectCallStatsSensor):
+class GoToConnectIncomingCallsSensor(GoToConnectDailySensor):
     """Sensor for incoming calls today."""
 
     _attr_name = "Incoming Calls Today"
-    _attr_unique_id = f"{DOMAIN}_incoming_calls"
+    _sensor_key = SENSOR_INCOMING_CALLS
     _attr_native_unit_of_measurement = "calls"
 
     @property
@@ -87,11 +162,11 @@ class GoToConnectIncomingCallsSensor(GoToConnectCallStatsSensor):
         return data.get("incoming_calls", 0)
 
 
-class GoToConnectOutgoingCallsSensor(GoToConnectCallStatsSensor):
+class GoToConnectOutgoingCallsSensor(GoToConnectDailySensor):
     """Sensor for outgoing calls today."""
 
     _attr_name = "Outgoing Calls Today"
-    _attr_unique_id = f"{DOMAIN}_outgoing_calls"
+    _sensor_key = SENSOR_OUTGOING_CALLS
     _attr_native_unit_of_measurement = "calls"
 
     @property
@@ -103,11 +178,11 @@ class GoToConnectOutgoingCallsSensor(GoToConnectCallStatsSensor):
         return data.get("outgoing_calls", 0)
 
 
-class GoToConnectMissedCallsSensor(GoToConnectCallStatsSensor):
+class GoToConnectMissedCallsSensor(GoToConnectDailySensor):
     """Sensor for missed calls today."""
 
     _attr_name = "Missed Calls Today"
-    _attr_unique_id = f"{DOMAIN}_missed_calls"
+    _sensor_key = SENSOR_MISSED_CALLS
     _attr_native_unit_of_measurement = "calls"
 
     @property
@@ -119,12 +194,13 @@ class GoToConnectMissedCallsSensor(GoToConnectCallStatsSensor):
         return data.get("missed_calls", 0)
 
 
-class GoToConnectCallDurationSensor(GoToConnectCallStatsSensor):
+class GoToConnectCallDurationSensor(GoToConnectDailySensor):
     """Sensor for total call duration today."""
 
     _attr_name = "Total Call Duration Today"
-    _attr_unique_id = f"{DOMAIN}_call_duration"
-    _attr_native_unit_of_measurement = "seconds"
+    _sensor_key = SENSOR_CALL_DURATION
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
 
     @property
     def native_value(self) -> Optional[int]:
@@ -150,8 +226,10 @@ class GoToConnectAverageCallDurationSensor(GoToConnectCallStatsSensor):
     """Sensor for average call duration today."""
 
     _attr_name = "Average Call Duration Today"
-    _attr_unique_id = f"{DOMAIN}_average_call_duration"
-    _attr_native_unit_of_measurement = "seconds"
+    _sensor_key = SENSOR_AVERAGE_CALL_DURATION
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
 
     @property
     def native_value(self) -> Optional[float]:
@@ -172,22 +250,20 @@ class GoToConnectAverageCallDurationSensor(GoToConnectCallStatsSensor):
         return attrs
 
 
-class GoToConnectTodayCallsSensor(GoToConnectCallStatsSensor):
+class GoToConnectTodayCallsSensor(GoToConnectDailySensor):
     """Sensor for today's call statistics."""
 
     _attr_name = "Today's Call Statistics"
-    _attr_unique_id = f"{DOMAIN}_today_calls"
+    _sensor_key = SENSOR_TODAY_CALLS
+    _attr_native_unit_of_measurement = "calls"
 
     @property
-    def native_value(self) -> Optional[str]:
+    def native_value(self) -> Optional[int]:
         """Return the native value of the sensor."""
         data = self.coordinator.data
         if not data:
             return None
-        
-        today_data = data.get("today", {})
-        total = today_data.get("total", 0)
-        return f"{total} calls today"
+        return data.get("today", {}).get("total", 0)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -210,18 +286,17 @@ class GoToConnectWeekCallsSensor(GoToConnectCallStatsSensor):
     """Sensor for this week's call statistics."""
 
     _attr_name = "This Week's Call Statistics"
-    _attr_unique_id = f"{DOMAIN}_week_calls"
+    _sensor_key = SENSOR_WEEK_CALLS
+    _attr_native_unit_of_measurement = "calls"
+    _attr_state_class = SensorStateClass.MEASUREMENT
 
     @property
-    def native_value(self) -> Optional[str]:
+    def native_value(self) -> Optional[int]:
         """Return the native value of the sensor."""
         data = self.coordinator.data
         if not data:
             return None
-        
-        week_data = data.get("week", {})
-        total = week_data.get("total", 0)
-        return f"{total} calls this week"
+        return data.get("week", {}).get("total", 0)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -244,18 +319,17 @@ class GoToConnectMonthCallsSensor(GoToConnectCallStatsSensor):
     """Sensor for this month's call statistics."""
 
     _attr_name = "This Month's Call Statistics"
-    _attr_unique_id = f"{DOMAIN}_month_calls"
+    _sensor_key = SENSOR_MONTH_CALLS
+    _attr_native_unit_of_measurement = "calls"
+    _attr_state_class = SensorStateClass.MEASUREMENT
 
     @property
-    def native_value(self) -> Optional[str]:
+    def native_value(self) -> Optional[int]:
         """Return the native value of the sensor."""
         data = self.coordinator.data
         if not data:
             return None
-        
-        month_data = data.get("month", {})
-        total = month_data.get("total", 0)
-        return f"{total} calls this month"
+        return data.get("month", {}).get("total", 0)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -271,4 +345,205 @@ class GoToConnectMonthCallsSensor(GoToConnectCallStatsSensor):
                 "month_missed": month_data.get("missed", 0),
                 "month_average_duration": month_data.get("average_duration", 0),
             })
-        return attrs 
\ No newline at end of file
+        return attrs
+
+
+class GoToConnectDurationPercentileSensor(GoToConnectCallStatsSensor):
+    """Sensor for a call duration percentile over a period."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, period: str, percentile: int) -> None:
+        """Initialize the sensor."""
+        self._sensor_key = (
+            f"{period}_{SENSOR_DURATION_PERCENTILE.format(percentile=percentile)}"
+        )
+        super().__init__(coordinator)
+        self._period = period
+        self._key = f"p{percentile}"
+        self._attr_name = f"Call Duration P{percentile} {PERIOD_NAMES[period]}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the native value of the sensor."""
+        data = self.coordinator.data
+        if not data:
+            return None
+
+        percentiles = data.get(self._period, {}).get("duration_percentiles", {})
+        value = percentiles.get(self._key)
+        return round(value, 1) if value is not None else None
+
+
+class GoToConnectDurationDistributionSensor(GoToConnectCallStatsSensor):
+    """Sensor for the call duration histogram over a period."""
+
+    _attr_native_unit_of_measurement = "calls"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, period: str) -> None:
+        """Initialize the sensor."""
+        self._sensor_key = f"{period}_{SENSOR_DURATION_DISTRIBUTION}"
+        super().__init__(coordinator)
+        self._period = period
+        self._attr_name = f"Call Duration Distribution {PERIOD_NAMES[period]}"
+
+    @property
+    def native_value(self) -> Optional[int]:
+        """Return the native value of the sensor."""
+        data = self.coordinator.data
+        if not data:
+            return None
+        return data.get(self._period, {}).get("answered", 0)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        attrs = super().extra_state_attributes
+        data = self.coordinator.data
+        if data:
+            period_data = data.get(self._period, {})
+            attrs.update(period_data.get("duration_histogram", {}))
+            for key, value in period_data.get("duration_percentiles", {}).items():
+                attrs[f"{key}_duration"] = round(value, 1) if value is not None else None
+        return attrs
+
+
+class GoToConnectGroupCallsSensor(GoToConnectDailySensor):
+    """Sensor for the calls of one line, user or call queue."""
+
+    _attr_native_unit_of_measurement = "calls"
+
+    def __init__(self, coordinator, dimension: str, group_id: str) -> None:
+        """Initialize the sensor."""
+        self._sensor_key = f"{dimension}_{group_id}_{SENSOR_GROUP_CALLS}"
+        super().__init__(coordinator)
+        self._dimension = dimension
+        self._group_id = group_id
+        self._attr_name = f"{GROUP_NAMES[dimension]} {group_id} Calls Today"
+
+    def _group_data(self) -> dict[str, Any]:
+        """Return the period statistics of the group."""
+        data = self.coordinator.data or {}
+        return data.get("groups", {}).get(self._dimension, {}).get(self._group_id, {})
+
+    @property
+    def native_value(self) -> Optional[int]:
+        """Return the native value of the sensor."""
+        if not self.coordinator.data:
+            return None
+        # A group whose calls have all aged out has had no calls today
+        return self._group_data().get(PERIOD_TODAY, {}).get("total", 0)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        attrs = super().extra_state_attributes
+        if self.coordinator.data:
+            attrs[self._dimension] = self._group_id
+            for period, period_data in self._group_data().items():
+                attrs.update({
+                    f"{period}_total": period_data.get("total", 0),
+                    f"{period}_incoming": period_data.get("incoming", 0),
+                    f"{period}_outgoing": period_data.get("outgoing", 0),
+                    f"{period}_missed": period_data.get("missed", 0),
+                    f"{period}_average_duration": period_data.get("average_duration", 0),
+                })
+        return attrs
+
+
+class GoToConnectDiagnosticSensor(GoToConnectCallStatsSensor):
+    """Base class for sensors reporting how the polls perform.
+
+    They are disabled by default; the same figures are always available
+    in the config entry's diagnostics.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+
+class GoToConnectPollDurationSensor(GoToConnectDiagnosticSensor):
+    """Sensor for the duration of the last poll and its stages."""
+
+    _attr_name = "Poll Duration"
+    _sensor_key = SENSOR_POLL_DURATION
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the native value of the sensor."""
+        value = self.coordinator.metrics.last_poll.get(STAGE_TOTAL)
+        return round(value, 3) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        attrs = super().extra_state_attributes
+        metrics = self.coordinator.metrics
+        for stage in STAGES:
+            for percentile in (50, 95):
+                value = metrics.percentile(stage, percentile)
+                attrs[f"{stage}_p{percentile}"] = (
+                    round(value, 3) if value is not None else None
+                )
+        return attrs
+
+
+class GoToConnectCounterSensor(GoToConnectDiagnosticSensor):
+    """Sensor for a cumulative poll counter."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _counter: str
+
+    @property
+    def native_value(self) -> int:
+        """Return the native value of the sensor."""
+        return self.coordinator.metrics.counters[self._counter]
+
+
+class GoToConnectApiRequestsSensor(GoToConnectCounterSensor):
+    """Sensor for the API requests sent, retries included."""
+
+    _attr_name = "API Requests"
+    _sensor_key = SENSOR_API_REQUESTS
+    _attr_native_unit_of_measurement = "requests"
+    _counter = COUNTER_REQUESTS
+
+
+class GoToConnectBytesReceivedSensor(GoToConnectCounterSensor):
+    """Sensor for the bytes of calls pages received."""
+
+    _attr_name = "Bytes Received"
+    _sensor_key = SENSOR_BYTES_RECEIVED
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _counter = COUNTER_BYTES_RECEIVED
+
+
+class GoToConnectCallsProcessedSensor(GoToConnectCounterSensor):
+    """Sensor for the calls decoded and merged, re-fetched ones included."""
+
+    _attr_name = "Calls Processed"
+    _sensor_key = SENSOR_CALLS_PROCESSED
+    _attr_native_unit_of_measurement = "calls"
+    _counter = COUNTER_CALLS_PROCESSED
+
+
+class GoToConnectUserInfoCacheHitRateSensor(GoToConnectDiagnosticSensor):
+    """Sensor for the share of polls that did not re-download user info."""
+
+    _attr_name = "User Info Cache Hit Rate"
+    _sensor_key = SENSOR_USER_INFO_CACHE_HIT_RATE
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the native value of the sensor."""
+        rate = self.coordinator.metrics.user_info_hit_rate
+        return round(rate * 100, 1) if rate is not None else None 
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Mergeable quantile sketch for GoTo Connect Call Stats integration."""
+
+import math
+from typing import Dict, List, Optional
+
+from .const import SKETCH_RELATIVE_ACCURACY
+
+
+class DDSketch:
+    """Quantile sketch with a relative accuracy guarantee (DDSketch).
+
+    Positive values are counted in logarithmically sized bins, so any
+    quantile is returned within the relative accuracy of the true value.
+    Sketches of the same accuracy merge by adding bin counts, which lets
+    daily sketches be combined into weekly and monthly ones, and values
+    can be removed again when a call's duration is corrected.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "bins", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        """Initialize an empty sketch."""
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        """Return the bin a positive value falls into."""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Return the representative value of a bin."""
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value to the sketch."""
+        if value > 0:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+
+    def remove(self, value: float) -> None:
+        """Remove a value that was previously added."""
+        if value > 0:
+            key = self._key(value)
+            remaining = self.bins.get(key, 0) - 1
+            if remaining < 0:
+                return
+            if remaining:
+                self.bins[key] = remaining
+            else:
+                del self.bins[key]
+        elif self.zero_count:
+            self.zero_count -= 1
+        else:
+            return
+        self.count -= 1
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add the contents of another sketch of the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the approximate q-quantile, or None if the sketch is empty."""
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return self._value(key)
+        return self._value(max(self.bins))
+
+    def count_at_most(self, value: float) -> int:
+        """Return the approximate number of values no larger than value."""
+        if value <= 0:
+            return self.zero_count
+        limit = self._key(value)
+        return self.zero_count + sum(
+            count for key, count in self.bins.items() if key <= limit
+        )
+
+    def histogram(self, bounds: List[float]) -> List[int]:
+        """Return value counts per bucket split at the given upper bounds.
+
+        The result has one more entry than bounds, for values above the
+        last bound.
+        """
+        counts = []
+        below = 0
+        for bound in bounds:
+            at_most = self.count_at_most(bound)
+            counts.append(at_most - below)
+            below = at_most
+        counts.append(self.count - below)
+        return counts
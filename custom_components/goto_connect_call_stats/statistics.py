@@ -0,0 +1,210 @@
+"""Long-term statistics import for GoTo Connect Call Stats integration."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant
+
+from .aggregator import from_timestamp
+from .const import DEFAULT_NAME, DOMAIN
+from .store import GoToCallStore
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Hourly series imported, in the column order of the store's hourly totals:
+# statistic key, name and unit
+STATISTIC_SERIES = (
+    ("calls", "Calls", "calls"),
+    ("incoming_calls", "Incoming calls", "calls"),
+    ("outgoing_calls", "Outgoing calls", "calls"),
+    ("missed_calls", "Missed calls", "calls"),
+    ("call_duration", "Call duration", UnitOfTime.SECONDS),
+)
+
+
+class GoToStatisticsImporter:
+    """Push hourly call totals into long-term statistics.
+
+    Every series is an external statistic with a running sum, so long
+    history graphs read the recorder's hourly rows instead of raw sensor
+    states. Hours are imported once they are settled, i.e. older than
+    the calls the next sync may still correct; the first import
+    backfills every hour held in the local call store. Hours older than
+    that, added to the store by a backfill, are imported by a rebuild.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, store: GoToCallStore
+    ) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self.store = store
+        name = entry.title or DEFAULT_NAME
+        object_id = entry.entry_id.lower()
+        self._metadata: Dict[str, StatisticMetaData] = {
+            key: StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{name} {label}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{object_id}_{key}",
+                unit_of_measurement=unit,
+            )
+            for key, label, unit in STATISTIC_SERIES
+        }
+        # Running sums and the end of the last imported hour (naive UTC)
+        self._sums: Optional[Dict[str, float]] = None
+        self._imported_until: Optional[datetime] = None
+        # Imports and rebuilds both move the running sums
+        self._lock = asyncio.Lock()
+
+    async def _async_load_last(self) -> None:
+        """Continue from the last hour already held by the recorder."""
+        sums: Dict[str, float] = {}
+        for key, metadata in self._metadata.items():
+            last = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics,
+                self.hass,
+                1,
+                metadata["statistic_id"],
+                False,
+                {"sum"},
+            )
+            rows = last.get(metadata["statistic_id"])
+            if not rows:
+                sums[key] = 0.0
+                continue
+
+            sums[key] = rows[0]["sum"] or 0.0
+            last_hour = from_timestamp(rows[0]["start"])
+            if self._imported_until is None or last_hour + _HOUR > self._imported_until:
+                self._imported_until = last_hour + _HOUR
+        self._sums = sums
+
+    async def _async_sum_before(self, statistic_id: str, before: datetime) -> float:
+        """Return the running sum of the last hour imported before a time."""
+        # Monthly rows carry the sum of their last hour, so this reads a
+        # few rows however long the history is
+        stats = await get_instance(self.hass).async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            _EPOCH,
+            before.replace(tzinfo=timezone.utc),
+            {statistic_id},
+            "month",
+            None,
+            {"sum"},
+        )
+        rows = stats.get(statistic_id)
+        return (rows[-1]["sum"] or 0.0) if rows else 0.0
+
+    async def _async_hours_since(self, statistic_id: str, since: datetime) -> List[Any]:
+        """Return the hourly rows imported since a time."""
+        stats = await get_instance(self.hass).async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            since.replace(tzinfo=timezone.utc),
+            None,
+            {statistic_id},
+            "hour",
+            None,
+            {"state", "sum"},
+        )
+        return stats.get(statistic_id, [])
+
+    async def async_import(self, settled: datetime) -> None:
+        """Import every hour that ended before a settled time (naive UTC)."""
+        until = settled.replace(minute=0, second=0, microsecond=0)
+        async with self._lock:
+            if self._sums is None:
+                await self._async_load_last()
+            if self._imported_until is not None and until <= self._imported_until:
+                return
+
+            since = self._imported_until or from_timestamp(0)
+            rows = await self.store.async_hourly_totals(since, until)
+            self._imported_until = until
+            if not rows:
+                return
+
+            statistics: Dict[str, List[StatisticData]] = {
+                key: [] for key in self._metadata
+            }
+            for hour, *values in rows:
+                start = datetime.fromtimestamp(hour, timezone.utc)
+                for key, value in zip(self._metadata, values):
+                    self._sums[key] += value
+                    statistics[key].append(
+                        StatisticData(start=start, state=value, sum=self._sums[key])
+                    )
+
+            for key, metadata in self._metadata.items():
+                async_add_external_statistics(self.hass, metadata, statistics[key])
+            _LOGGER.debug(
+                "Imported call statistics for %d hours up to %s", len(rows), until
+            )
+
+    async def async_rebuild(self, since: datetime, until: datetime) -> None:
+        """Re-import the hours of a range (naive UTC) from the call store.
+
+        Used after a backfill added calls older than the hours already
+        imported: the range is imported again continuing the sum of the
+        hour before it, and every later hour is shifted by the difference
+        so the sums stay continuous.
+        """
+        async with self._lock:
+            if self._sums is None:
+                await self._async_load_last()
+            if self._imported_until is None or since >= self._imported_until:
+                # The regular import has not reached the range yet
+                return
+
+            until = min(until, self._imported_until)
+            rows = await self.store.async_hourly_totals(since, until)
+            for index, (key, metadata) in enumerate(self._metadata.items()):
+                statistic_id = metadata["statistic_id"]
+                running = await self._async_sum_before(statistic_id, since)
+                previous_sum = await self._async_sum_before(statistic_id, until)
+
+                statistics: List[StatisticData] = []
+                for hour, *values in rows:
+                    running += values[index]
+                    statistics.append(
+                        StatisticData(
+                            start=datetime.fromtimestamp(hour, timezone.utc),
+                            state=values[index],
+                            sum=running,
+                        )
+                    )
+
+                shift = running - previous_sum
+                if shift:
+                    for row in await self._async_hours_since(statistic_id, until):
+                        statistics.append(
+                            StatisticData(
+                                start=datetime.fromtimestamp(row["start"], timezone.utc),
+                                state=row["state"],
+                                sum=(row["sum"] or 0.0) + shift,
+                            )
+                        )
+                    self._sums[key] += shift
+
+                if statistics:
+                    async_add_external_statistics(self.hass, metadata, statistics)
+            _LOGGER.debug(
+                "Rebuilt call statistics for %d hours from %s", len(rows), since
+            )
@@ -0,0 +1,222 @@
+"""Local call store for GoTo Connect Call Stats integration."""
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .aggregator import CallRecord, from_timestamp, to_timestamp
+from .const import DOMAIN, STORE_RETENTION_DAYS
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS calls (
+        call_id TEXT PRIMARY KEY,
+        start_ts REAL NOT NULL,
+        duration INTEGER NOT NULL,
+        direction TEXT NOT NULL,
+        line_id TEXT,
+        user_key TEXT,
+        queue_id TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS calls_start_ts ON calls (start_ts)",
+    "CREATE INDEX IF NOT EXISTS calls_direction ON calls (direction, start_ts)",
+    """
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+_HIGH_WATER_MARK = "high_water_mark"
+
+
+class GoToCallStore:
+    """SQLite store of synced calls for one config entry.
+
+    All database work runs in the executor; the async_* methods are the
+    entry points for the event loop.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.path = hass.config.path(f"{DOMAIN}.{entry_id}.db")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            # auto_vacuum only takes effect before the first table is created
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def _load(self, since: datetime) -> Tuple[List[CallRecord], Optional[datetime]]:
+        """Load the calls started since a time and the high-water mark."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT call_id, start_ts, duration, direction, line_id, user_key, "
+                "queue_id FROM calls WHERE start_ts >= ? ORDER BY start_ts",
+                (to_timestamp(since),),
+            ).fetchall()
+            mark = conn.execute(
+                "SELECT value FROM sync_state WHERE key = ?", (_HIGH_WATER_MARK,)
+            ).fetchone()
+
+        records = [
+            CallRecord(call_id, from_timestamp(start_ts), duration, direction, *groups)
+            for call_id, start_ts, duration, direction, *groups in rows
+        ]
+        high_water_mark = datetime.fromisoformat(mark[0]) if mark else None
+        return records, high_water_mark
+
+    def _get_state(self, key: str) -> Optional[str]:
+        """Return a sync state value."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _save(
+        self,
+        records: Iterable[CallRecord],
+        high_water_mark: Optional[datetime],
+        state: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Upsert calls, the high-water mark and sync state in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO calls (call_id, start_ts, duration, "
+                    "direction, line_id, user_key, queue_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            record.call_id,
+                            to_timestamp(record.start),
+                            record.duration,
+                            record.direction,
+                            record.line_id,
+                            record.user_key,
+                            record.queue_id,
+                        )
+                        for record in records
+                    ),
+                )
+                state = dict(state or {})
+                if high_water_mark is not None:
+                    state[_HIGH_WATER_MARK] = high_water_mark.isoformat()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                    state.items(),
+                )
+
+    def _hourly_totals(
+        self, since: datetime, until: datetime
+    ) -> List[Tuple[float, int, int, int, int, int]]:
+        """Return per-hour call counts and talk time for a time range.
+
+        Each row holds the hour's start timestamp, then the number of
+        calls, incoming, outgoing and missed calls, and the total duration.
+        """
+        with self._lock:
+            conn = self._connect()
+            return conn.execute(
+                "SELECT CAST(start_ts / 3600 AS INTEGER) * 3600 AS hour, COUNT(*), "
+                "SUM(direction = 'incoming'), SUM(direction = 'outgoing'), "
+                "SUM(direction = 'missed'), SUM(duration) FROM calls "
+                "WHERE start_ts >= ? AND start_ts < ? GROUP BY hour ORDER BY hour",
+                (to_timestamp(since), to_timestamp(until)),
+            ).fetchall()
+
+    def _compact(self, before: datetime) -> int:
+        """Delete calls older than the retention window and reclaim space."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM calls WHERE start_ts < ?", (to_timestamp(before),)
+                ).rowcount
+            if deleted:
+                # Each row returned frees one page, so drain the cursor
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+        return deleted
+
+    def _close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remove(self) -> None:
+        """Close and delete the database files."""
+        self._close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+    async def async_load(
+        self, since: datetime
+    ) -> Tuple[List[CallRecord], Optional[datetime]]:
+        """Load the calls started since a time and the high-water mark."""
+        return await self.hass.async_add_executor_job(self._load, since)
+
+    async def async_get_state(self, key: str) -> Optional[str]:
+        """Return a sync state value."""
+        return await self.hass.async_add_executor_job(self._get_state, key)
+
+    async def async_save(
+        self,
+        records: List[CallRecord],
+        high_water_mark: Optional[datetime],
+        state: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Persist call records, the high-water mark and sync state."""
+        await self.hass.async_add_executor_job(
+            self._save, records, high_water_mark, state
+        )
+
+    async def async_hourly_totals(
+        self, since: datetime, until: datetime
+    ) -> List[Tuple[float, int, int, int, int, int]]:
+        """Return per-hour call counts and talk time for a time range."""
+        return await self.hass.async_add_executor_job(
+            self._hourly_totals, since, until
+        )
+
+    async def async_compact(self, now: datetime) -> None:
+        """Apply the retention policy."""
+        before = now - timedelta(days=STORE_RETENTION_DAYS)
+        deleted = await self.hass.async_add_executor_job(self._compact, before)
+        if deleted:
+            _LOGGER.debug("Removed %d calls older than %s from call store", deleted, before)
+
+    async def async_close(self) -> None:
+        """Close the store."""
+        await self.hass.async_add_executor_job(self._close)
+
+    async def async_remove(self) -> None:
+        """Delete the store from disk."""
+        await self.hass.async_add_executor_job(self._remove)